@@ -0,0 +1,81 @@
+"""Functions executed inside the FastAPI service's worker processes.
+
+Each worker holds its own model (mapping the saved artifact when there is
+one) and parser, installed by init_worker when the process pool starts, so
+requests only ship the resume text or file bytes across the process
+boundary. Results come back together with per-stage timings for the
+service's /metrics. The training process reports progress through a queue
+installed by init_training_worker.
+"""
+import time
+
+from model import TRAINING_MODE, SmartHireModel
+from resume_parser import ResumeParser
+from profiling import RequestProfiler
+
+_model = None
+_parser = None
+_training_progress = None
+
+
+def init_worker(model):
+    """Process pool initializer: install the model snapshot this pool serves"""
+    global _model, _parser
+    _model = model
+    _parser = ResumeParser()
+
+
+def analyze_text(resume_text, cleaned=False):
+    """Domain prediction, role recommendation and skill analysis for one resume, plus stage timings"""
+    timings = {}
+    return _model.full_analysis(resume_text, timings, cleaned), timings
+
+
+def parse_file(file_content, filename):
+    """Extract and clean the text of one uploaded resume, plus the parse time"""
+    started = time.perf_counter()
+    result = _parser.parse_resume(file_content, filename)
+    return result, {'parse': time.perf_counter() - started}
+
+
+def init_training_worker(progress_queue):
+    """Training pool initializer: progress updates go to the service through this queue"""
+    global _training_progress
+    _training_progress = progress_queue
+
+
+def report_training_progress(job_id, stage, fraction):
+    if _training_progress is not None and job_id is not None:
+        _training_progress.put((job_id, stage, fraction))
+
+
+def train_model(job_id=None):
+    """Train a fresh model, persist it and hand it back to the service together with the training report"""
+    model = SmartHireModel()
+    progress = lambda stage, fraction: report_training_progress(job_id, stage, fraction)
+    if TRAINING_MODE == 'hashing':
+        result = model.train_model_streaming(progress=progress)
+    else:
+        result = model.train_model(progress=progress)
+    if result['status'] == 'success':
+        # Saved first, so the service and its workers map the artifact instead of receiving copies
+        report_training_progress(job_id, 'saving', 0.95)
+        saved = model.save_artifact()
+        if saved['status'] == 'success':
+            result['model_version'] = saved['model_version']
+    return result, model
+
+
+def parse_and_analyze(file_content, filename):
+    """Parse one uploaded resume and analyze its text in a single round trip"""
+    parse_result, timings = parse_file(file_content, filename)
+    if not parse_result['success']:
+        return parse_result, None, timings
+    return parse_result, _model.full_analysis(parse_result['text'], timings), timings
+
+
+def run_profiled(mode, func, *args):
+    """Run one worker function under cProfile, returning its results, the profile report, then its timings"""
+    with RequestProfiler(mode) as profiler:
+        *result, timings = func(*args)
+    return (*result, profiler.report(), timings)
@@ -1,17 +1,104 @@
-from fastapi import FastAPI, HTTPException, UploadFile, File
+from fastapi import FastAPI, HTTPException, UploadFile, File, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
+from starlette.routing import Match
 from model import SmartHireModel
-from resume_parser import ResumeParser
-import uvicorn
+from near_duplicates import NearDuplicateIndex
+from similarity_index import SimilarityIndex, DEFAULT_INDEX_PATH as SIMILARITY_INDEX_PATH
+from artifacts import read_manifest
+from result_cache import ResultCache, cache_key
+from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, ServiceMetrics
+import profiling
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from typing import List
+import multiprocessing
+import asyncio
+import json
+import os
+import queue
+import threading
+import time
+import uuid
+import analysis_worker
+
+# Worker processes for parsing and inference; 0 runs them on threads in this process
+WORKER_PROCESSES = int(os.environ.get('SMARTHIRE_WORKERS', os.cpu_count() or 1))
+
+# Files of one /analyze/batch request being parsed/analyzed at the same time
+BATCH_MAX_IN_FLIGHT = int(os.environ.get('SMARTHIRE_BATCH_WINDOW', 2 * max(WORKER_PROCESSES, 1)))
+
+# Finished training jobs kept for GET /train/{job_id}
+TRAINING_JOB_HISTORY = int(os.environ.get('SMARTHIRE_TRAINING_JOB_HISTORY', 20))
+
+# Resumes added through POST /similar/resumes before the similarity index is saved to disk
+SIMILARITY_SAVE_EVERY = int(os.environ.get('SIMILARITY_SAVE_EVERY', 100))
+
+# Largest top_k /similar serves
+SIMILAR_MAX_RESULTS = 100
+
+inference_pool = None
+training_pool = None
+training_progress = None
+similarity_index = None
+similarity_save_lock = threading.Lock()
+
+def create_executor(max_workers, **kwargs):
+    """Process pool (spawned, so no event-loop state is forked) or thread pool when workers are disabled"""
+    if WORKER_PROCESSES > 0:
+        return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn'), **kwargs)
+    return ThreadPoolExecutor(max_workers=max_workers)
+
+def start_inference_pool():
+    """(Re)start the inference pool so every worker serves the current model"""
+    global inference_pool
+    previous_pool = inference_pool
+    if WORKER_PROCESSES > 0:
+        inference_pool = create_executor(WORKER_PROCESSES, initializer=analysis_worker.init_worker,
+                                        initargs=(smart_hire_model,))
+    else:
+        analysis_worker.init_worker(smart_hire_model)
+        inference_pool = create_executor(os.cpu_count() or 1)
+    
+    # Requests already queued on the old pool still finish there
+    if previous_pool is not None:
+        previous_pool.shutdown(wait=False)
+
+async def run_inference(func, *args):
+    """Run CPU-bound parsing/analysis off the event loop, recording the stage timings the worker reports"""
+    loop = asyncio.get_running_loop()
+    started = time.perf_counter()
+    *result, timings = await loop.run_in_executor(inference_pool, func, *args)
+    metrics.stage_duration.observe(time.perf_counter() - started, stage='worker_roundtrip')
+    metrics.observe_stages(timings)
+    return result[0] if len(result) == 1 else tuple(result)
+
+@asynccontextmanager
+async def lifespan(app):
+    global training_pool, training_progress
+    # Serve the last trained classifier straight away; workers memory-map the same artifact files
+    smart_hire_model.load_artifact()
+    load_similarity_index(smart_hire_model)
+    start_inference_pool()
+    training_progress = multiprocessing.get_context('spawn').Queue()
+    if WORKER_PROCESSES > 0:
+        training_pool = create_executor(1, initializer=analysis_worker.init_training_worker,
+                                        initargs=(training_progress,))
+    else:
+        analysis_worker.init_training_worker(training_progress)
+        training_pool = create_executor(1)
+    yield
+    inference_pool.shutdown(wait=False, cancel_futures=True)
+    training_pool.shutdown(wait=False, cancel_futures=True)
+    save_similarity_index()
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Smart Hire API",
     description="AI-Powered Resume Classification and Role Recommendation System",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -25,12 +112,144 @@ app.add_middleware(
 
 # Initialize models
 smart_hire_model = SmartHireModel()
-resume_parser = ResumeParser()
+
+# Analyses keyed by cleaned text + model version; parses keyed by upload bytes
+analysis_cache = ResultCache()
+parse_cache = ResultCache()
+
+# MinHash signatures of analyzed resumes, so re-submissions with small edits reuse their analysis
+near_duplicates = NearDuplicateIndex()
+
+# Request, stage and input-size metrics served on /metrics
+metrics = ServiceMetrics()
+metrics.registry.add_collector(metrics.cache_collector(lambda: {'analysis': analysis_cache, 'parse': parse_cache}))
+
+def metrics_route(request):
+    """Route template used as the metrics label, so raw paths cannot blow up cardinality"""
+    for route in app.routes:
+        match, _ = route.matches(request.scope)
+        if match == Match.FULL:
+            return route.path
+    return 'unmatched'
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    started = time.perf_counter()
+    route = metrics_route(request)
+    status = 500
+    metrics.in_flight.inc(route=route)
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # Streaming responses are timed until their body iterator is handed back
+        metrics.in_flight.dec(route=route)
+        metrics.requests.inc(route=route, method=request.method, status=status)
+        metrics.request_duration.observe(time.perf_counter() - started, route=route, method=request.method)
+
+def load_similarity_index(model):
+    """Serve the saved similar-resume index if it holds this model's vectors, otherwise none until one is built"""
+    global similarity_index
+    if similarity_index is not None and similarity_index.metadata.get('model_version') == model.model_version:
+        return
+    similarity_index = None
+    manifest = read_manifest(SIMILARITY_INDEX_PATH)
+    if manifest is None or manifest.get('metadata', {}).get('model_version') != model.model_version:
+        return
+    try:
+        similarity_index = SimilarityIndex.load(SIMILARITY_INDEX_PATH)
+        print(f"🧭 Similarity index loaded: {len(similarity_index)} resumes")
+    except Exception as e:
+        print(f"⚠️ Could not load similarity index at {SIMILARITY_INDEX_PATH}: {e}")
+
+def save_similarity_index():
+    """Persist resumes inserted since the last save; skipped while another save is running"""
+    index = similarity_index
+    if index is None or not index.pending or not similarity_save_lock.acquire(blocking=False):
+        return
+    try:
+        # An index of a model that has since been replaced must not overwrite one built for the served model
+        if index.metadata.get('model_version') != smart_hire_model.model_version:
+            print("⚠️ Not saving the similarity index: it was built with a model that is no longer served")
+            return
+        index.save(SIMILARITY_INDEX_PATH)
+    except Exception as e:
+        print(f"⚠️ Could not save similarity index to {SIMILARITY_INDEX_PATH}: {e}")
+    finally:
+        similarity_save_lock.release()
+
+def current_similarity_index(model, create=False):
+    """The similarity index, if its vectors come from the model being served; create=True starts an empty one"""
+    global similarity_index
+    if similarity_index is None:
+        # Picks up an index similarity_index.py has built since startup or the last retrain
+        load_similarity_index(model)
+    if similarity_index is None and create:
+        similarity_index = SimilarityIndex.create(model.feature_dimension(),
+                                                  metadata={'model_version': model.model_version})
+    if similarity_index is None:
+        raise HTTPException(status_code=503, detail="Similarity index not built. Run similarity_index.py "
+                                                    "or add resumes through POST /similar/resumes.")
+    if similarity_index.metadata.get('model_version') != model.model_version:
+        raise HTTPException(status_code=409, detail="Similarity index was built with another model; "
+                                                    "rebuild it with similarity_index.py")
+    return similarity_index
+
+def model_is_current(model):
+    """Whether the model a request started with is still served; results of a replaced one must not be cached"""
+    return model.model_version == smart_hire_model.model_version
+
+async def cached_analysis(resume_text, source=None):
+    """Full analysis of a resume, reused for identical cleaned text or a near-duplicate under the same model"""
+    # The model that the pool below serves, even if a retrain swaps it while we wait
+    model = smart_hire_model
+    analysis_cache.ensure_version(model.model_version)
+    near_duplicates.ensure_version(model.model_version)
+    with metrics.stage('clean'):
+        cleaned_text = model.clean_text(resume_text)
+    metrics.resume_words.observe(len(cleaned_text.split()))
+    key = cache_key('analysis', model.model_version, cleaned_text)
+    result = analysis_cache.get(key)
+    if result is None:
+        with metrics.stage('near_duplicate'):
+            signature = near_duplicates.signature(cleaned_text)
+            match = near_duplicates.find(signature)
+        if match is not None:
+            (original_source, original_result), similarity = match
+            return {**original_result, "near_duplicate": {"of": original_source, "similarity": round(similarity, 4)}}
+        
+        # The worker analyzes the text cleaned here instead of cleaning it again
+        result = await run_inference(analysis_worker.analyze_text, cleaned_text, True)
+        if result['status'] == 'success' and model_is_current(model):
+            analysis_cache.set(key, result)
+            near_duplicates.add(key, signature, (source, result))
+    return result
+
+async def cached_parse(file_content, filename):
+    """Parse an uploaded resume, reusing the result for byte-identical re-uploads"""
+    key = cache_key('parse', filename.lower().rsplit('.', 1)[-1], file_content)
+    result = parse_cache.get(key)
+    if result is None:
+        result = await run_inference(analysis_worker.parse_file, file_content, filename)
+        if result['success']:
+            parse_cache.set(key, result)
+    return result
 
 # Request models
 class ResumeAnalysisRequest(BaseModel):
     text: str
 
+class SimilarResumesRequest(BaseModel):
+    text: str = None
+    resume_id: str = None
+    top_k: int = 10
+    probes: int = None
+
+class IndexResumeRequest(BaseModel):
+    resume_id: str
+    text: str
+
 class AnalysisResponse(BaseModel):
     status: str
     analysis: dict = None
@@ -48,7 +267,8 @@ async def root():
             "Top 3 Role Recommendations",
             "Skill-based Matching",
             "Resume Parsing (PDF/DOCX)",
-            "HR Dashboard Integration"
+            "HR Dashboard Integration",
+            "Similar Resume Search"
         ]
     }
 
@@ -57,40 +277,166 @@ async def health_check():
     return {
         "status": "healthy", 
         "model_trained": smart_hire_model.is_trained,
-        "domains_available": len(smart_hire_model.label_encoder.classes_) if smart_hire_model.label_encoder else 0
+        "domains_available": len(smart_hire_model.domain_names) if smart_hire_model.domain_names is not None else 0,
+        "model_version": smart_hire_model.model_version,
+        "cache": {"analysis": analysis_cache.stats(), "parse": parse_cache.stats(),
+                  "near_duplicates": near_duplicates.stats()}
     }
 
-@app.post("/train")
+@app.get("/cache/stats")
+async def cache_stats():
+    """Hit/miss/eviction counters of the result caches"""
+    return {"analysis": analysis_cache.stats(), "parse": parse_cache.stats(),
+            "near_duplicates": near_duplicates.stats()}
+
+@app.get("/metrics")
+async def prometheus_metrics():
+    """Request, stage latency and input size metrics in the Prometheus text format"""
+    return PlainTextResponse(metrics.render(), media_type=METRICS_CONTENT_TYPE)
+
+@app.get("/profiles/{profile_id}")
+async def download_profile(profile_id: str, request: Request):
+    """Download a profile saved by a ?profile=save request (pstats format)"""
+    if not profiling.is_authorized(request.headers.get(profiling.ADMIN_TOKEN_HEADER)):
+        raise HTTPException(status_code=403, detail="Profile downloads require a valid admin token")
+    
+    path = profiling.profile_path(profile_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail=f"Profile '{profile_id}' not found")
+    return FileResponse(path, media_type="application/octet-stream", filename=f"{profile_id}.prof")
+
+# Training jobs by ID, oldest first, and the tasks running them
+training_jobs = {}
+training_tasks = set()
+
+def update_training_progress():
+    """Apply the progress updates the training worker has sent so far"""
+    while True:
+        try:
+            job_id, stage, fraction = training_progress.get_nowait()
+        except queue.Empty:
+            return
+        job = training_jobs.get(job_id)
+        if job is not None and job['status'] == 'running':
+            job['stage'] = stage
+            job['progress'] = fraction
+
+def active_training_job():
+    return next((job for job in training_jobs.values() if job['status'] in ('queued', 'running')), None)
+
+async def run_training_job(job):
+    """Train a new model in the training process, then publish it with one reference swap"""
+    global smart_hire_model
+    loop = asyncio.get_running_loop()
+    job.update(status='running', started_at=time.time())
+    try:
+        result, trained_model = await loop.run_in_executor(training_pool, analysis_worker.train_model,
+                                                           job['job_id'])
+    except Exception as e:
+        result, trained_model = {"status": "error", "message": f"Training failed: {str(e)}"}, None
+    update_training_progress()
+    
+    if result['status'] == 'success':
+        # No await between these lines: every request sees either the old model, pool and index or the new ones
+        smart_hire_model = trained_model
+        start_inference_pool()
+        # The old index holds the old model's vectors: serve a saved one for the new model, or start over
+        load_similarity_index(trained_model)
+        job.update(status='succeeded', stage='done', progress=1.0, model_version=trained_model.model_version)
+    else:
+        job.update(status='failed', error=result.get('message'))
+    job['finished_at'] = time.time()
+    job['result'] = result
+    
+    # Forget the oldest finished jobs
+    finished = [job_id for job_id, old_job in training_jobs.items() if old_job.get('finished_at')]
+    for job_id in finished[:max(0, len(finished) - TRAINING_JOB_HISTORY)]:
+        del training_jobs[job_id]
+
+@app.post("/train", status_code=202)
 async def train_model():
-    """Train the classification model with the dataset"""
-    result = smart_hire_model.train_model()
-    return result
+    """Start training the classification model in the background; poll /train/{job_id} for progress"""
+    running = active_training_job()
+    if running is not None:
+        return JSONResponse(status_code=409, content={
+            "detail": "A training job is already running", "job_id": running['job_id'],
+            "status_url": f"/train/{running['job_id']}"
+        })
+    
+    job_id = uuid.uuid4().hex
+    job = training_jobs[job_id] = {
+        "job_id": job_id,
+        "status": "queued",
+        "stage": None,
+        "progress": 0.0,
+        "created_at": time.time(),
+        "started_at": None,
+        "finished_at": None,
+        "model_version": None,
+        "error": None,
+        "result": None
+    }
+    task = asyncio.create_task(run_training_job(job))
+    training_tasks.add(task)
+    task.add_done_callback(training_tasks.discard)
+    return {"job_id": job_id, "status": job['status'], "status_url": f"/train/{job_id}"}
+
+@app.get("/train/jobs")
+async def training_job_list():
+    """Recent training jobs, oldest first"""
+    update_training_progress()
+    return {"jobs": list(training_jobs.values())}
+
+@app.get("/train/{job_id}")
+async def training_job_status(job_id: str):
+    """Status, current stage and progress (0-1) of a training job; includes the training report once finished"""
+    update_training_progress()
+    job = training_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Training job '{job_id}' not found")
+    return job
 
 @app.post("/analyze/resume")
 async def analyze_resume(request: ResumeAnalysisRequest):
     """Complete analysis: domain + role recommendations"""
-    result = smart_hire_model.full_analysis(request.text)
+    metrics.resume_bytes.observe(len(request.text.encode('utf-8')))
+    result = await cached_analysis(request.text)
     return result
 
 @app.post("/analyze/upload")
-async def analyze_uploaded_resume(file: UploadFile = File(...)):
-    """Analyze uploaded resume file"""
+async def analyze_uploaded_resume(request: Request, file: UploadFile = File(...)):
+    """Analyze uploaded resume file; admins can profile the parse + analysis with X-Profile or ?profile="""
+    profile_mode = profiling.requested_mode(request.headers, request.query_params)
+    if profile_mode and not profiling.is_authorized(request.headers.get(profiling.ADMIN_TOKEN_HEADER)):
+        raise HTTPException(status_code=403, detail="Profiling requires a valid admin token")
+    
     try:
         # Read file content
-        file_content = await file.read()
+        with metrics.stage('upload_read'):
+            file_content = await file.read()
+        metrics.resume_bytes.observe(len(file_content))
         
         if len(file_content) == 0:
             raise HTTPException(status_code=400, detail="Empty file uploaded")
         
-        # Parse resume
-        parse_result = resume_parser.parse_resume(file_content, file.filename)
+        profile = None
+        if profile_mode:
+            # Profiled uploads skip the caches and run parse + analysis under cProfile in the worker
+            parse_result, analysis_result, profile = await run_inference(
+                analysis_worker.run_profiled, profile_mode, analysis_worker.parse_and_analyze,
+                file_content, file.filename
+            )
+        else:
+            # Parse resume
+            parse_result = await cached_parse(file_content, file.filename)
         if not parse_result['success']:
             raise HTTPException(status_code=400, detail=parse_result['error'])
         
         # Analyze with AI model
-        analysis_result = smart_hire_model.full_analysis(parse_result['text'])
+        if not profile_mode:
+            analysis_result = await cached_analysis(parse_result['text'], file.filename)
         
-        return {
+        response = {
             "status": "success",
             "filename": file.filename,
             "parsing_info": {
@@ -99,57 +445,161 @@ async def analyze_uploaded_resume(file: UploadFile = File(...)):
             },
             "analysis": analysis_result.get('analysis', {}) if analysis_result['status'] == 'success' else {}
         }
+        if 'near_duplicate' in analysis_result:
+            response["near_duplicate"] = analysis_result['near_duplicate']
+        if profile is not None:
+            response["profile"] = profile
+        return response
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
+async def analyze_batch_file(file):
+    """Parse and analyze one file of a batch, returning its result record"""
+    try:
+        with metrics.stage('upload_read'):
+            file_content = await file.read()
+        metrics.resume_bytes.observe(len(file_content))
+        
+        if len(file_content) == 0:
+            return {"filename": file.filename, "status": "error", "error": "Empty file"}
+        
+        parse_key = cache_key('parse', file.filename.lower().rsplit('.', 1)[-1], file_content)
+        parse_result = parse_cache.get(parse_key)
+        if parse_result is not None:
+            analysis_result = await cached_analysis(parse_result['text'], file.filename)
+        else:
+            # The model that the pool below serves, even if a retrain swaps it while we wait
+            model = smart_hire_model
+            # One worker round trip per uncached file instead of one for parsing and one for analysis
+            parse_result, analysis_result = await run_inference(analysis_worker.parse_and_analyze,
+                                                                file_content, file.filename)
+            if parse_result['success']:
+                parse_cache.set(parse_key, parse_result)
+                # A result from a model replaced during the round trip is returned but not remembered
+                if analysis_result['status'] == 'success' and model_is_current(model):
+                    analysis_cache.ensure_version(model.model_version)
+                    near_duplicates.ensure_version(model.model_version)
+                    cleaned_text = model.clean_text(parse_result['text'])
+                    key = cache_key('analysis', model.model_version, cleaned_text)
+                    analysis_cache.set(key, analysis_result)
+                    # Parsed and analyzed in one round trip, so a near-duplicate can only be flagged here
+                    signature = near_duplicates.signature(cleaned_text)
+                    match = near_duplicates.find(signature)
+                    if match is not None:
+                        (original_source, _), similarity = match
+                        analysis_result = {**analysis_result, "near_duplicate": {"of": original_source,
+                                                                                 "similarity": round(similarity, 4)}}
+                    else:
+                        near_duplicates.add(key, signature, (file.filename, analysis_result))
+        
+        if not parse_result['success']:
+            return {"filename": file.filename, "status": "error", "error": parse_result['error']}
+        
+        record = {
+            "filename": file.filename,
+            "status": "success",
+            "analysis": analysis_result.get('analysis', {}) if analysis_result['status'] == 'success' else {}
+        }
+        if 'near_duplicate' in analysis_result:
+            record["near_duplicate"] = analysis_result['near_duplicate']
+        return record
+        
+    except Exception as e:
+        return {"filename": file.filename, "status": "error", "error": str(e)}
+
 @app.post("/analyze/batch")
 async def analyze_batch_resumes(files: List[UploadFile] = File(...)):
-    """Analyze multiple resumes in batch"""
-    results = []
+    """Analyze multiple resumes in parallel, streaming one NDJSON record per file as it completes"""
     
-    for file in files:
+    async def generate():
+        started = time.perf_counter()
+        successful = failed = 0
+        pending = {}
+        next_index = 0
+        
         try:
-            file_content = await file.read()
-            
-            if len(file_content) == 0:
-                results.append({
-                    "filename": file.filename,
-                    "status": "error",
-                    "error": "Empty file"
-                })
-                continue
-                
-            parse_result = resume_parser.parse_resume(file_content, file.filename)
-            
-            if parse_result['success']:
-                analysis_result = smart_hire_model.full_analysis(parse_result['text'])
-                results.append({
-                    "filename": file.filename,
-                    "status": "success",
-                    "analysis": analysis_result.get('analysis', {}) if analysis_result['status'] == 'success' else {}
-                })
-            else:
-                results.append({
-                    "filename": file.filename,
-                    "status": "error",
-                    "error": parse_result['error']
-                })
+            while next_index < len(files) or pending:
+                # Keep at most BATCH_MAX_IN_FLIGHT files queued on the workers
+                while next_index < len(files) and len(pending) < BATCH_MAX_IN_FLIGHT:
+                    task = asyncio.create_task(analyze_batch_file(files[next_index]))
+                    pending[task] = next_index
+                    next_index += 1
                 
-        except Exception as e:
-            results.append({
-                "filename": file.filename,
-                "status": "error",
-                "error": str(e)
-            })
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    record = {"index": pending.pop(task), **task.result()}
+                    if record['status'] == 'success':
+                        successful += 1
+                    else:
+                        failed += 1
+                    yield json.dumps(record) + "\n"
+        finally:
+            # Client went away: stop feeding the workers
+            for task in pending:
+                task.cancel()
+        
+        yield json.dumps({
+            "summary": True,
+            "total_processed": successful + failed,
+            "successful": successful,
+            "failed": failed,
+            "elapsed_seconds": round(time.perf_counter() - started, 3)
+        }) + "\n"
+    
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+@app.post("/similar")
+async def similar_resumes(request: SimilarResumesRequest):
+    """Most similar indexed resumes to a resume text or an indexed resume; probes trades latency for recall"""
+    model = smart_hire_model
+    if not model.is_trained:
+        raise HTTPException(status_code=500, detail="Model not trained")
+    index = current_similarity_index(model)
+    if request.resume_id is None and not request.text:
+        raise HTTPException(status_code=400, detail="Provide 'text' or 'resume_id'")
+    if request.resume_id is not None and request.resume_id not in index.rows:
+        raise HTTPException(status_code=404, detail=f"Resume '{request.resume_id}' is not indexed")
+    top_k = min(max(request.top_k, 1), SIMILAR_MAX_RESULTS)
+    
+    def search():
+        if request.resume_id is not None:
+            vector = index.vector(request.resume_id)
+        else:
+            vector = model.resume_vector(request.text)
+        return index.search(*vector, top_k, request.probes, exclude=request.resume_id)
     
+    started = time.perf_counter()
+    with metrics.stage('similar_search'):
+        hits, stats = await asyncio.to_thread(search)
     return {
-        "total_processed": len(results),
-        "successful": len([r for r in results if r['status'] == 'success']),
-        "failed": len([r for r in results if r['status'] == 'error']),
-        "results": results
+        "similar": [{"resume_id": resume_id, "similarity": round(similarity, 4)} for resume_id, similarity in hits],
+        "count": len(hits),
+        "search": stats,
+        "search_time_ms": round(1000 * (time.perf_counter() - started), 2)
     }
 
+@app.post("/similar/resumes", status_code=201)
+async def index_resume(request: IndexResumeRequest):
+    """Add a resume to the similarity index; it can be found right away and is saved with the next batch"""
+    model = smart_hire_model
+    if not model.is_trained:
+        raise HTTPException(status_code=500, detail="Model not trained")
+    index = current_similarity_index(model, create=True)
+    if not request.text or len(request.text.strip()) < 10:
+        raise HTTPException(status_code=400, detail="Resume text too short")
+    
+    vector = await asyncio.to_thread(model.resume_vector, request.text)
+    try:
+        index.add(request.resume_id, *vector)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    
+    if index.pending >= SIMILARITY_SAVE_EVERY:
+        asyncio.get_running_loop().run_in_executor(None, save_similarity_index)
+    return {"status": "indexed", "resume_id": request.resume_id, "indexed_resumes": len(index),
+            "unsaved": index.pending}
+
 @app.get("/domains")
 async def get_domains():
     """Get available domains and roles"""
@@ -161,11 +611,13 @@ async def model_status():
     """Get model training status"""
     return {
         "is_trained": smart_hire_model.is_trained,
-        "domains_count": len(smart_hire_model.label_encoder.classes_) if smart_hire_model.label_encoder else 0,
+        "domains_count": len(smart_hire_model.domain_names) if smart_hire_model.domain_names is not None else 0,
         "available_roles": len(smart_hire_model.DOMAIN_ROLES) if smart_hire_model.DOMAIN_ROLES else 0
     }
 
 if __name__ == "__main__":
+    import uvicorn
+    
     uvicorn.run(
         app,
         host="0.0.0.0",
@@ -0,0 +1,106 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+
+# Bump when the on-disk layout changes; older artifacts are rebuilt
+ARTIFACT_FORMAT_VERSION = 1
+MANIFEST_NAME = 'manifest.json'
+
+
+def content_hash(obj):
+    """Stable SHA-256 of a JSON-serializable object"""
+    payload = json.dumps(obj, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def file_hash(path):
+    """SHA-256 of a file's bytes"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def save_artifact(path, kind, arrays, metadata=None):
+    """Write arrays as .npy files plus a manifest, replacing any artifact at path atomically"""
+    path = os.path.abspath(path)
+    staging = f"{path}.tmp-{os.getpid()}"
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+
+    array_entries = {}
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        if array.dtype == object:
+            raise ValueError(f"Array '{name}' has dtype=object and cannot be memory-mapped")
+        filename = f"{name}.npy"
+        np.save(os.path.join(staging, filename), array, allow_pickle=False)
+        array_entries[name] = {
+            'file': filename,
+            'dtype': array.dtype.str,
+            'shape': list(array.shape),
+            'sha256': file_hash(os.path.join(staging, filename))
+        }
+
+    metadata = metadata or {}
+    manifest = {
+        'format_version': ARTIFACT_FORMAT_VERSION,
+        'kind': kind,
+        'created_at': time.time(),
+        'metadata': metadata,
+        'arrays': array_entries,
+        'content_hash': content_hash({
+            'kind': kind,
+            'metadata': metadata,
+            'arrays': {name: entry['sha256'] for name, entry in array_entries.items()}
+        })
+    }
+    with open(os.path.join(staging, MANIFEST_NAME), 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+    # Swap directories so readers never observe a half-written artifact
+    previous = f"{path}.old-{os.getpid()}"
+    if os.path.exists(path):
+        os.replace(path, previous)
+    os.replace(staging, path)
+    shutil.rmtree(previous, ignore_errors=True)
+
+    return manifest
+
+
+def read_manifest(path):
+    """Return the artifact manifest, or None if path holds no readable artifact"""
+    try:
+        with open(os.path.join(path, MANIFEST_NAME)) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if manifest.get('format_version') != ARTIFACT_FORMAT_VERSION:
+        return None
+    return manifest
+
+
+def load_artifact(path, kind, mmap=True, verify=False):
+    """Load an artifact's arrays (memory-mapped by default) and its manifest"""
+    manifest = read_manifest(path)
+    if manifest is None:
+        raise FileNotFoundError(f"No compatible artifact at {path}")
+    if manifest.get('kind') != kind:
+        raise ValueError(f"Artifact at {path} is '{manifest.get('kind')}', expected '{kind}'")
+
+    arrays = {}
+    for name, entry in manifest['arrays'].items():
+        array_path = os.path.join(path, entry['file'])
+        if verify and file_hash(array_path) != entry['sha256']:
+            raise ValueError(f"Artifact array '{name}' does not match its recorded hash")
+        # Empty arrays cannot be memory-mapped
+        use_mmap = mmap and int(np.prod(entry['shape'])) > 0
+        arrays[name] = np.load(array_path, mmap_mode='r' if use_mmap else None, allow_pickle=False)
+
+    return arrays, manifest
@@ -0,0 +1,112 @@
+"""Cold-start benchmark for the Flask (main.py) and FastAPI (app.py) services.
+
+Every run spawns a fresh interpreter and measures, inside that process:
+  - import_seconds:    importing the service module (main.py also loads its model here)
+  - model_load_seconds: loading the job catalog (main.py), or the app.py lifespan startup
+                        (model artifact, worker pools, similarity index)
+  - first_response_seconds: serving the first request through the framework test client
+  - app_lifetime_seconds: app.py only, lifespan startup through first analysis and shutdown
+  - total_seconds:     interpreter start to first response
+It also records which heavy libraries ended up imported.
+
+Usage (from the backend directory):
+    python benchmarks/cold_start.py --repeat 5 --output cold_start.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ['pandas', 'sklearn', 'scipy', 'nltk', 'pdfplumber', 'pypdf', 'docx']
+
+PROBE = r'''
+import json, sys, time, io, contextlib
+start = time.perf_counter()
+service, backend_dir, spawned_at = sys.argv[1], sys.argv[2], float(sys.argv[3])
+sys.path.insert(0, backend_dir)
+result = {"interpreter_seconds": time.time() - spawned_at}
+
+with contextlib.redirect_stdout(io.StringIO()):
+    t0 = time.perf_counter()
+    if service == "main":
+        import main as service_module
+        client = service_module.app.test_client()
+        result["import_seconds"] = time.perf_counter() - t0
+        t1 = time.perf_counter()
+        fresh = service_module.CompleteJobRoleSystem()
+        fresh.load_complete_model()
+        result["model_load_seconds"] = time.perf_counter() - t1
+        t2 = time.perf_counter()
+        response = client.post("/predict", json={"resume_text": "Python developer with django flask experience and machine learning"})
+        status = response.status_code
+        result["first_response_seconds"] = time.perf_counter() - t2
+    else:
+        import app as service_module
+        from fastapi.testclient import TestClient
+        result["import_seconds"] = time.perf_counter() - t0
+        # Entering the client runs the lifespan (artifact load, pools, similarity index); the first
+        # analysis starts a worker process, which then maps the model artifact
+        t1 = time.perf_counter()
+        with TestClient(service_module.app) as client:
+            result["model_load_seconds"] = time.perf_counter() - t1
+            t2 = time.perf_counter()
+            status = client.post("/analyze/resume", json={"text": "Python developer with django flask experience and machine learning"}).status_code
+            result["first_response_seconds"] = time.perf_counter() - t2
+        result["app_lifetime_seconds"] = time.perf_counter() - t1
+
+result["status"] = status
+result["total_seconds"] = result["interpreter_seconds"] + (time.perf_counter() - start)
+result["heavy_modules_loaded"] = sorted(m for m in %r if m in sys.modules)
+print(json.dumps(result))
+''' % (HEAVY_MODULES,)
+
+
+def run_once(service):
+    """Run one fresh-interpreter cold start and return its measurements"""
+    completed = subprocess.run(
+        [sys.executable, '-c', PROBE, service, BACKEND_DIR, repr(time.time())],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def summarize(runs):
+    """Median of every numeric measurement across runs"""
+    summary = {}
+    for key, value in runs[0].items():
+        if isinstance(value, (int, float)) and key != 'status':
+            summary[key] = round(statistics.median(run[key] for run in runs), 4)
+    summary['status'] = runs[-1]['status']
+    summary['heavy_modules_loaded'] = runs[-1]['heavy_modules_loaded']
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure service cold-start time")
+    parser.add_argument('--service', choices=['main', 'app', 'all'], default='all')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    services = ['main', 'app'] if args.service == 'all' else [args.service]
+    results = {}
+    for service in services:
+        runs = [run_once(service) for _ in range(args.repeat)]
+        results[service] = summarize(runs)
+
+        print(f"⏱️  {service}.py cold start (median of {args.repeat})")
+        for key, value in results[service].items():
+            print(f"   {key:<24} {value}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"📊 Results saved to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,201 @@
+"""Latency/throughput benchmarks for the scoring and parsing hot paths.
+
+Inputs are real resumes sampled from dataset/data/category. Each case is called
+repeatedly over those inputs and reports per-call p50/p95/p99 latency (ms),
+mean latency and ops/sec:
+  - job_system.clean_text / predict_top_roles_for_resume / explain_with_keywords  (main.py)
+  - smart_hire.predict_domain / full_analysis                                      (model.py)
+  - resume_parser.parse_resume                                                     (resume_parser.py)
+
+Results are written as JSON. Against a baseline file, any case whose p50 or p95
+grew by more than --threshold makes the run exit with status 1. Latencies only
+compare on the same machine, so no baseline is checked in: record one before a
+change and compare against it after.
+
+Usage (from the backend directory):
+    python benchmarks/hot_paths.py --save-baseline /tmp/hot_paths_baseline.json
+    python benchmarks/hot_paths.py --baseline /tmp/hot_paths_baseline.json --threshold 0.2
+"""
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+DEFAULT_DATASET = os.path.join(os.path.dirname(BACKEND_DIR), 'dataset', 'data', 'category')
+# Latency statistics compared against the baseline
+COMPARED_STATS = ['p50_ms', 'p95_ms']
+
+
+def measure(func, inputs, min_calls, min_seconds, warmup=3):
+    """Call func over the inputs (cycling) until both call and time minimums are met"""
+    for args in inputs[:warmup]:
+        func(*args)
+
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < min_calls or time.perf_counter() - started < min_seconds:
+        args = inputs[len(timings) % len(inputs)]
+        call_started = time.perf_counter_ns()
+        func(*args)
+        timings.append(time.perf_counter_ns() - call_started)
+    elapsed = time.perf_counter() - started
+
+    timings_ms = np.array(timings) / 1e6
+    return {
+        'calls': len(timings),
+        'p50_ms': round(float(np.percentile(timings_ms, 50)), 4),
+        'p95_ms': round(float(np.percentile(timings_ms, 95)), 4),
+        'p99_ms': round(float(np.percentile(timings_ms, 99)), 4),
+        'mean_ms': round(float(timings_ms.mean()), 4),
+        'ops_per_second': round(len(timings) / elapsed, 2)
+    }
+
+
+def load_inputs(dataset_dir, per_category):
+    """The first PDFs of every category as (bytes, filename, category, parsed text)"""
+    from resume_parser import ResumeParser
+
+    parser = ResumeParser()
+    documents = []
+    paths = []
+    for category_dir in sorted(glob.glob(os.path.join(dataset_dir, '*', ''))):
+        paths.extend(sorted(glob.glob(os.path.join(category_dir, '*.pdf')))[:per_category])
+
+    for path in paths:
+        with open(path, 'rb') as f:
+            content = f.read()
+        parsed = parser.parse_resume(content, os.path.basename(path))
+        if parsed['success'] and parsed['word_count'] >= 5:
+            category = os.path.basename(os.path.dirname(path)).upper()
+            documents.append((content, os.path.basename(path), category, parsed['text']))
+    return documents
+
+
+def build_cases(documents, quiet=True):
+    """Benchmark name -> (callable, list of argument tuples)"""
+    from model import SmartHireModel
+    from resume_parser import ResumeParser
+    import pandas as pd
+
+    output = io.StringIO() if quiet else sys.stdout
+    with contextlib.redirect_stdout(output):
+        import main
+        job_system = main.CompleteJobRoleSystem()
+        job_system.load_complete_model()
+
+        smart_hire = SmartHireModel()
+        training_df = pd.DataFrame({'domain': [doc[2] for doc in documents],
+                                    'resume_text': [doc[3] for doc in documents]})
+        result = smart_hire.train_model(training_df)
+    if result['status'] != 'success':
+        raise RuntimeError(f"Could not train SmartHireModel on the sample: {result['message']}")
+
+    texts = [(doc[3],) for doc in documents]
+    rng = random.Random(0)
+    explain_inputs = [(doc[3], rng.randrange(len(job_system.job_role_names))) for doc in documents]
+    parser = ResumeParser()
+
+    return {
+        'job_system.clean_text': (job_system.clean_text, texts),
+        'job_system.predict_top_roles_for_resume': (job_system.predict_top_roles_for_resume, texts),
+        'job_system.explain_with_keywords': (job_system.explain_with_keywords, explain_inputs),
+        'smart_hire.predict_domain': (smart_hire.predict_domain, texts),
+        'smart_hire.full_analysis': (smart_hire.full_analysis, texts),
+        'resume_parser.parse_resume': (parser.parse_resume, [(doc[0], doc[1]) for doc in documents])
+    }
+
+
+def compare(results, baseline, threshold):
+    """Regressions where a compared latency grew by more than threshold (a fraction)"""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get('cases', {}).get(name)
+        if not previous:
+            continue
+        for stat in COMPARED_STATS:
+            if previous.get(stat) and current[stat] > previous[stat] * (1 + threshold):
+                regressions.append({
+                    'case': name,
+                    'stat': stat,
+                    'baseline': previous[stat],
+                    'current': current[stat],
+                    'change': round(current[stat] / previous[stat] - 1, 4)
+                })
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scoring and parsing hot paths")
+    parser.add_argument('--dataset', default=DEFAULT_DATASET)
+    # SmartHireModel's stratified 80/20 split needs a few resumes per category
+    parser.add_argument('--per-category', type=int, default=6, help="Dataset PDFs per category used as inputs")
+    parser.add_argument('--cases', nargs='+', help="Only run cases whose name contains one of these strings")
+    parser.add_argument('--min-calls', type=int, default=50)
+    parser.add_argument('--min-seconds', type=float, default=1.0)
+    parser.add_argument('--output', help="Write results as JSON to this file")
+    parser.add_argument('--baseline', help="Compare against this results file")
+    parser.add_argument('--save-baseline', help="Also write the results to this baseline file")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="Allowed p50/p95 slowdown against the baseline (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    documents = load_inputs(args.dataset, args.per_category)
+    if not documents:
+        print(f"❌ No parsable PDFs found under {args.dataset}")
+        sys.exit(1)
+    print(f"📄 Benchmark inputs: {len(documents)} resumes from {args.dataset}")
+
+    cases = build_cases(documents)
+    if args.cases:
+        cases = {name: case for name, case in cases.items() if any(part in name for part in args.cases)}
+
+    results = {}
+    for name, (func, inputs) in cases.items():
+        results[name] = measure(func, inputs, args.min_calls, args.min_seconds)
+        stats = results[name]
+        print(f"⏱️  {name:<42} p50 {stats['p50_ms']:>9.3f}ms  p95 {stats['p95_ms']:>9.3f}ms  "
+              f"p99 {stats['p99_ms']:>9.3f}ms  {stats['ops_per_second']:>10.1f} ops/s")
+
+    report = {
+        'created_at': time.time(),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'inputs': len(documents),
+        'cases': results
+    }
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        report['baseline'] = args.baseline
+        report['regressions'] = regressions
+
+    for path in filter(None, [args.output, args.save_baseline]):
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"📊 Results saved to {path}")
+
+    if regressions:
+        print(f"❌ {len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+        for regression in regressions:
+            print(f"   {regression['case']} {regression['stat']}: {regression['baseline']} -> "
+                  f"{regression['current']} ms (+{regression['change']:.0%})")
+        sys.exit(1)
+    if args.baseline:
+        print(f"✅ No regressions beyond {args.threshold:.0%} against {args.baseline}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""Throughput and extracted-token agreement of the ResumeParser PDF backends.
+
+Every backend extracts the same sample of dataset PDFs. pdfplumber, the
+layout-aware backend, is the reference. For each backend the benchmark reports:
+  - docs_per_second / pages_per_second
+  - token_jaccard: mean Jaccard overlap of cleaned-text tokens with the reference
+  - exact_token_match: share of documents whose token sets equal the reference
+  - empty_documents: documents for which the backend produced no text
+
+Usage (from the backend directory):
+    python benchmarks/pdf_backends.py --limit 200 --output pdf_backends.json
+"""
+import argparse
+import glob
+import json
+import os
+import statistics
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from resume_parser import PDF_BACKENDS, ResumeParser
+
+DEFAULT_DATASET = os.path.join(os.path.dirname(BACKEND_DIR), 'dataset', 'data', 'category')
+REFERENCE_BACKEND = 'pdfplumber'
+
+
+def sample_pdfs(dataset_dir, limit):
+    """Evenly spaced sample of PDFs across all categories"""
+    paths = sorted(glob.glob(os.path.join(dataset_dir, '*', '*.pdf')))
+    if limit and len(paths) > limit:
+        step = len(paths) / limit
+        paths = [paths[int(i * step)] for i in range(limit)]
+    return paths
+
+
+def run_backend(backend, documents):
+    """Extract every document with one backend, without budgets or fallback"""
+    parser = ResumeParser(max_pages=10 ** 6, max_chars=10 ** 9, max_seconds=10 ** 6, pdf_backend=backend)
+    tokens, pages, empty = [], 0, 0
+
+    started = time.perf_counter()
+    for content in documents:
+        stats = {}
+        try:
+            text = "\n".join(parser.iter_pdf_pages(content, stats))
+        except Exception:
+            text = ""
+        pages += stats.get('pages_read', 0)
+        empty += not text.strip()
+        tokens.append(set(parser.clean_text(text).split()))
+    elapsed = time.perf_counter() - started
+
+    return tokens, {
+        'seconds': round(elapsed, 3),
+        'docs_per_second': round(len(documents) / elapsed, 2),
+        'pages_per_second': round(pages / elapsed, 2),
+        'empty_documents': empty
+    }
+
+
+def agreement(tokens, reference):
+    """Mean Jaccard overlap and exact-match share against the reference token sets"""
+    jaccards = [len(a & b) / len(a | b) if a | b else 1.0 for a, b in zip(tokens, reference)]
+    return {
+        'token_jaccard': round(statistics.mean(jaccards), 4),
+        'min_token_jaccard': round(min(jaccards), 4),
+        'exact_token_match': round(sum(j == 1.0 for j in jaccards) / len(jaccards), 4)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare ResumeParser PDF backends")
+    parser.add_argument('--dataset', default=DEFAULT_DATASET)
+    parser.add_argument('--limit', type=int, default=100, help="Number of PDFs to sample (0 = all)")
+    parser.add_argument('--backends', nargs='+', default=sorted(PDF_BACKENDS), choices=sorted(PDF_BACKENDS))
+    parser.add_argument('--output', help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    paths = sample_pdfs(args.dataset, args.limit)
+    if not paths:
+        print(f"❌ No PDFs found under {args.dataset}")
+        sys.exit(1)
+    documents = [open(path, 'rb').read() for path in paths]
+    print(f"📄 Benchmarking {len(documents)} PDFs from {args.dataset}")
+
+    backends = [REFERENCE_BACKEND] + [b for b in args.backends if b != REFERENCE_BACKEND]
+    results, reference = {}, None
+    for backend in backends:
+        tokens, result = run_backend(backend, documents)
+        if reference is None:
+            reference = tokens
+        result.update(agreement(tokens, reference))
+        results[backend] = result
+
+        print(f"⏱️  {backend}")
+        for key, value in result.items():
+            print(f"   {key:<20} {value}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'documents': len(documents), 'reference': REFERENCE_BACKEND, 'backends': results}, f, indent=2)
+        print(f"📊 Results saved to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,242 @@
+"""Inverted index over stored resumes for ranking candidates against a job role or free text.
+
+Resumes are indexed on the same terms role matching uses: their cleaned words
+plus every catalog keyword phrase the PhraseMatcher finds. Postings hold
+cosine-normalized (1 + log tf) * idf weights sorted by resume, with each
+term's largest weight kept as its score upper bound. Queries are scored
+term-at-a-time with MaxScore pruning: once the terms left cannot lift an
+unseen resume into the top k, the remaining postings are only probed
+(binary search) for resumes still in contention instead of being scanned.
+
+Usage (from the backend directory):
+    python candidate_index.py --output models/candidate_index
+"""
+import argparse
+import math
+import os
+import sys
+import time
+from collections import Counter
+
+import numpy as np
+
+from artifacts import content_hash, load_artifact, save_artifact
+
+CANDIDATE_INDEX_KIND = 'candidate_index'
+DEFAULT_INDEX_PATH = os.environ.get(
+    'CANDIDATE_INDEX_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models', 'candidate_index')
+)
+
+
+def resume_terms(cleaned_text, keyword_matcher):
+    """Term frequencies of a cleaned resume: its words plus the catalog phrases it contains"""
+    tokens = cleaned_text.split()
+    counts = Counter(tokens)
+    for phrase in keyword_matcher.find_tokens(tokens):
+        # Single-word keywords are already counted as words
+        if ' ' in phrase:
+            counts[phrase] = 1
+    return counts
+
+
+def keywords_hash(keyword_matcher):
+    """Fingerprint of the catalog keyword phrases an index was built with"""
+    return content_hash(sorted(keyword_matcher.phrases))
+
+
+class CandidateIndex:
+    """Term -> (resume, weight) postings with per-term upper bounds for top-k search"""
+
+    def __init__(self, terms, idf, indptr, postings, weights, max_weights, resume_ids, categories, metadata=None):
+        self.terms = terms
+        self.term_ids = {term: idx for idx, term in enumerate(np.asarray(terms).tolist())}
+        self.idf = idf
+        self.indptr = indptr
+        self.postings = postings
+        self.weights = weights
+        self.max_weights = max_weights
+        self.resume_ids = resume_ids
+        self.categories = categories
+        self.metadata = metadata or {}
+        # (keyword matcher, whether it matches the build's phrases), checked once per loaded catalog
+        self._keywords_check = (None, False)
+
+    def __len__(self):
+        return len(self.resume_ids)
+
+    @classmethod
+    def build(cls, documents, keyword_matcher, min_df=2):
+        """Index (resume id, category, cleaned text) triples; terms in fewer than min_df resumes are dropped"""
+        from scipy import sparse
+
+        vocabulary = {}
+        rows, cols, counts = [], [], []
+        resume_ids, categories = [], []
+        for row, (resume_id, category, cleaned_text) in enumerate(documents):
+            resume_ids.append(str(resume_id))
+            categories.append(str(category))
+            for term, count in resume_terms(cleaned_text, keyword_matcher).items():
+                rows.append(row)
+                cols.append(vocabulary.setdefault(term, len(vocabulary)))
+                counts.append(count)
+
+        n_docs = len(resume_ids)
+        matrix = sparse.csc_matrix((np.asarray(counts, dtype=np.float64), (rows, cols)),
+                                   shape=(n_docs, len(vocabulary)))
+        document_freq = np.diff(matrix.indptr)
+        keep = np.flatnonzero(document_freq >= min_df)
+        matrix = matrix[:, keep].tocsr()
+        terms = np.array(list(vocabulary), dtype=object)[keep]
+
+        # Smoothed idf and sublinear tf, as the catalog's TfidfVectorizer weighs terms
+        idf = np.log((1 + n_docs) / (1 + document_freq[keep])) + 1
+        matrix.data = (np.log(matrix.data) + 1) * idf[matrix.indices]
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        matrix = sparse.diags(1 / np.where(norms > 0, norms, 1)) @ matrix
+        matrix = matrix.tocsc()
+        matrix.sort_indices()
+
+        has_postings = np.diff(matrix.indptr) > 0
+        max_weights = np.zeros(len(terms))
+        max_weights[has_postings] = np.maximum.reduceat(matrix.data, matrix.indptr[:-1][has_postings])
+
+        metadata = {'resumes': n_docs, 'terms': len(terms), 'min_df': min_df,
+                    'keywords_hash': keywords_hash(keyword_matcher)}
+        return cls(np.array(terms.tolist(), dtype=str), idf, matrix.indptr.astype(np.int64),
+                   matrix.indices.astype(np.int32), matrix.data.astype(np.float32), max_weights.astype(np.float32),
+                   np.array(resume_ids, dtype=str), np.array(categories, dtype=str), metadata)
+
+    def save(self, path):
+        """Write the index as a memory-mappable artifact"""
+        arrays = {
+            'terms': np.asarray(self.terms, dtype=str),
+            'idf': self.idf,
+            'indptr': self.indptr,
+            'postings': self.postings,
+            'weights': self.weights,
+            'max_weights': self.max_weights,
+            'resume_ids': self.resume_ids,
+            'categories': self.categories
+        }
+        return save_artifact(path, CANDIDATE_INDEX_KIND, arrays, self.metadata)
+
+    @classmethod
+    def load(cls, path=None, mmap=True):
+        arrays, manifest = load_artifact(path or DEFAULT_INDEX_PATH, CANDIDATE_INDEX_KIND, mmap=mmap)
+        index = cls(arrays['terms'], arrays['idf'], arrays['indptr'], arrays['postings'], arrays['weights'],
+                    arrays['max_weights'], arrays['resume_ids'], arrays['categories'], manifest['metadata'])
+        index.version = manifest['content_hash']
+        return index
+
+    def keywords_match(self, keyword_matcher):
+        """Whether the index was built with this catalog's phrases; otherwise phrase terms silently miss"""
+        checked_matcher, matches = self._keywords_check
+        if checked_matcher is not keyword_matcher:
+            matches = self.metadata.get('keywords_hash') == keywords_hash(keyword_matcher)
+            self._keywords_check = (keyword_matcher, matches)
+        return matches
+
+    def role_query(self, role_keywords):
+        """Query weights for a catalog role: each keyword weighted by its idf"""
+        return {keyword: float(self.idf[self.term_ids[keyword]])
+                for keyword in dict.fromkeys(role_keywords) if keyword in self.term_ids}
+
+    def text_query(self, cleaned_text, keyword_matcher):
+        """Query weights for free text: (1 + log tf) * idf of its words and catalog phrases"""
+        return {term: (1 + math.log(count)) * float(self.idf[self.term_ids[term]])
+                for term, count in resume_terms(cleaned_text, keyword_matcher).items() if term in self.term_ids}
+
+    def _term_postings(self, term):
+        term_id = self.term_ids[term]
+        start, end = self.indptr[term_id], self.indptr[term_id + 1]
+        return self.postings[start:end], self.weights[start:end], float(self.max_weights[term_id])
+
+    def search(self, query, top_k=50):
+        """Top k (resume row, score) pairs for {term: weight}, plus pruning counters"""
+        stats = {'terms': len(query), 'postings_scanned': 0, 'postings_probed': 0, 'pruned_terms': 0}
+        if not query or top_k <= 0 or len(self) == 0:
+            return [], stats
+
+        # Highest upper bound first, so the threshold rises as early as possible
+        terms = sorted(((weight, *self._term_postings(term)) for term, weight in query.items()),
+                       key=lambda entry: -entry[0] * entry[3])
+        bounds = np.array([weight * max_weight for weight, _, _, max_weight in terms])
+        remaining = np.append(np.cumsum(bounds[::-1])[::-1][1:], 0.0)
+
+        scores = np.zeros(len(self), dtype=np.float64)
+        candidates = None
+        touched = []
+        threshold = 0.0
+        for position, (weight, postings, weights, _) in enumerate(terms):
+            if candidates is None:
+                # Exhaustive phase: any resume may still make the top k
+                scores[postings] += weight * weights
+                touched.append(postings)
+                stats['postings_scanned'] += len(postings)
+                if remaining[position] == 0:
+                    continue
+                seen = np.unique(np.concatenate(touched)) if len(touched) > 1 else np.asarray(postings)
+                touched = [seen]
+                if len(seen) >= top_k:
+                    threshold = np.partition(scores[seen], len(seen) - top_k)[len(seen) - top_k]
+                if len(seen) >= top_k and remaining[position] < threshold:
+                    # Unseen resumes can reach at most remaining < threshold: only probe the contenders
+                    candidates = seen[scores[seen] + remaining[position] >= threshold]
+            else:
+                stats['pruned_terms'] += 1
+                stats['postings_probed'] += len(candidates)
+                slots = np.searchsorted(postings, candidates)
+                found = slots < len(postings)
+                found[found] = postings[slots[found]] == candidates[found]
+                scores[candidates[found]] += weight * weights[slots[found]]
+
+                threshold = max(threshold, np.partition(scores[candidates], len(candidates) - top_k)[len(candidates) - top_k])
+                candidates = candidates[scores[candidates] + remaining[position] >= threshold]
+
+        if candidates is None:
+            candidates = touched[0] if len(touched) == 1 else np.unique(np.concatenate(touched))
+        top = candidates[np.lexsort((candidates, -scores[candidates]))[:top_k]]
+        return [(int(row), float(scores[row])) for row in top], stats
+
+    def matched_terms(self, row, query):
+        """Query terms present in one indexed resume"""
+        matched = []
+        for term in query:
+            postings = self._term_postings(term)[0]
+            slot = np.searchsorted(postings, row)
+            if slot < len(postings) and postings[slot] == row:
+                matched.append(term)
+        return matched
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the candidate search index from the resume corpus")
+    parser.add_argument('--output', default=DEFAULT_INDEX_PATH, help="Index artifact directory")
+    parser.add_argument('--min-df', type=int, default=2, help="Drop terms found in fewer resumes than this")
+    args = parser.parse_args()
+
+    import contextlib
+    import io
+    from data_loader import DataLoader
+
+    # The catalog keyword matcher comes from the job matching service's system
+    with contextlib.redirect_stdout(io.StringIO()):
+        import main as job_service
+        df = DataLoader().load_dataset()
+    system = job_service.job_system
+    if not system.job_role_names:
+        print("❌ Job catalog could not be loaded")
+        sys.exit(1)
+
+    started = time.perf_counter()
+    documents = ((resume_id, domain, system.clean_text(text))
+                 for resume_id, domain, text in zip(df.index, df['domain'], df['resume_text']))
+    index = CandidateIndex.build(documents, system.keyword_matcher, min_df=args.min_df)
+    manifest = index.save(args.output)
+    print(f"✅ Indexed {len(index)} resumes ({index.metadata['terms']} terms) in "
+          f"{time.perf_counter() - started:.1f}s: {args.output} ({manifest['content_hash'][:12]})")
+
+
+if __name__ == '__main__':
+    main()
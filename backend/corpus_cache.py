@@ -0,0 +1,194 @@
+"""Incremental text-extraction cache for the dataset/data/category PDF corpus.
+
+Each PDF is labelled with its category directory and stored in a Parquet file
+keyed by the SHA-256 of its bytes. Re-runs only extract new or changed files.
+Training uses the cache only with RESUME_USE_CORPUS_CACHE=1; otherwise it
+reads the configured CSV dataset even when a cache file exists.
+
+Usage (from the repository root):
+    python backend/corpus_cache.py --workers 8
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from artifacts import content_hash, file_hash
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CORPUS_DIR = os.path.join(REPO_DIR, 'dataset', 'data', 'category')
+DEFAULT_CACHE_PATH = os.environ.get('RESUME_CORPUS_CACHE',
+                                    os.path.join(REPO_DIR, 'dataset', 'cache', 'resume_corpus.parquet'))
+# Training reads the cache instead of the configured CSV dataset only when asked to
+USE_CORPUS_CACHE = os.environ.get('RESUME_USE_CORPUS_CACHE', '0') == '1'
+
+CONFIG_METADATA_KEY = b'smarthire.extraction_config'
+
+_parser = None
+
+
+def extraction_config(pdf_backend, max_pages, max_chars):
+    """Settings that change the extracted text; a different config invalidates the whole cache"""
+    return {'pdf_backend': pdf_backend, 'max_pages': max_pages, 'max_chars': max_chars}
+
+
+def init_worker(config):
+    """Process pool initializer: one parser per worker, without a time budget"""
+    global _parser
+    from resume_parser import ResumeParser
+    _parser = ResumeParser(max_pages=config['max_pages'], max_chars=config['max_chars'],
+                           max_seconds=float('inf'), pdf_backend=config['pdf_backend'])
+
+
+def extract_pdf(job):
+    """Extract one PDF and return its cache row"""
+    path, sha256, relative_path, category = job
+    stats = {}
+    try:
+        with open(path, 'rb') as f:
+            text = _parser.extract_text_from_pdf(f.read(), stats)
+        error = None
+    except Exception as e:
+        text, error = '', str(e)
+
+    return {
+        'ID': os.path.splitext(os.path.basename(path))[0],
+        'Category': category,
+        'Resume_str': text,
+        'sha256': sha256,
+        'path': relative_path,
+        'pages': stats.get('pages_read', 0),
+        'backend': stats.get('backend'),
+        'error': error
+    }
+
+
+def scan_corpus(corpus_dir):
+    """List (path, relative path, category) for every PDF under corpus_dir/<CATEGORY>/"""
+    files = []
+    for category in sorted(os.listdir(corpus_dir)):
+        category_dir = os.path.join(corpus_dir, category)
+        if not os.path.isdir(category_dir):
+            continue
+        for name in sorted(os.listdir(category_dir)):
+            if name.lower().endswith('.pdf'):
+                files.append((os.path.join(category_dir, name), f"{category}/{name}", category.upper()))
+    return files
+
+
+def read_cache_rows(cache_path, config):
+    """Existing cache rows by sha256, or nothing when the cache is missing or built with another config"""
+    import pyarrow.parquet as pq
+
+    if not os.path.exists(cache_path):
+        return {}
+    try:
+        table = pq.read_table(cache_path)
+    except Exception as e:
+        print(f"⚠️ Ignoring unreadable cache {cache_path}: {e}")
+        return {}
+
+    metadata = table.schema.metadata or {}
+    if metadata.get(CONFIG_METADATA_KEY, b'').decode() != content_hash(config):
+        print("⚠️ Extraction settings changed, rebuilding the whole cache")
+        return {}
+    return {row['sha256']: row for row in table.to_pylist()}
+
+
+def write_cache(cache_path, rows, config):
+    """Write the rows as Parquet, replacing any previous cache atomically"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    # ID/Category/Resume_str keep the Kaggle Resume.csv column names
+    table = pa.Table.from_pylist(rows, schema=pa.schema([
+        ('ID', pa.string()), ('Category', pa.string()), ('Resume_str', pa.string()),
+        ('sha256', pa.string()), ('path', pa.string()), ('pages', pa.int32()),
+        ('backend', pa.string()), ('error', pa.string())
+    ], metadata={CONFIG_METADATA_KEY: content_hash(config).encode()}))
+
+    os.makedirs(os.path.dirname(os.path.abspath(cache_path)), exist_ok=True)
+    staging = f"{cache_path}.tmp-{os.getpid()}"
+    pq.write_table(table, staging, compression='zstd')
+    os.replace(staging, cache_path)
+
+
+def build_corpus_cache(corpus_dir=DEFAULT_CORPUS_DIR, cache_path=DEFAULT_CACHE_PATH, workers=None,
+                       pdf_backend=None, max_pages=None, max_chars=None):
+    """Bring the cache in line with the corpus, extracting only new or changed PDFs"""
+    from resume_parser import DEFAULT_MAX_CHARS, DEFAULT_MAX_PAGES, DEFAULT_PDF_BACKEND
+
+    started = time.perf_counter()
+    config = extraction_config(pdf_backend or DEFAULT_PDF_BACKEND,
+                               max_pages or DEFAULT_MAX_PAGES, max_chars or DEFAULT_MAX_CHARS)
+
+    files = scan_corpus(corpus_dir)
+    print(f"📂 Found {len(files)} PDFs in {corpus_dir}")
+    cached = read_cache_rows(cache_path, config)
+
+    rows, jobs = [], []
+    for path, relative_path, category in files:
+        sha256 = file_hash(path)
+        if sha256 in cached:
+            # Unchanged content; the file may have been renamed or moved to another category
+            rows.append(dict(cached[sha256], ID=os.path.splitext(os.path.basename(path))[0],
+                             Category=category, path=relative_path))
+        else:
+            jobs.append((path, sha256, relative_path, category))
+
+    print(f"♻️  Reusing {len(rows)} cached extractions, extracting {len(jobs)} PDFs")
+    if jobs:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count(), initializer=init_worker,
+                                 initargs=(config,)) as pool:
+            for done, row in enumerate(pool.map(extract_pdf, jobs, chunksize=4), 1):
+                rows.append(row)
+                if done % 100 == 0 or done == len(jobs):
+                    print(f"   Extracted {done}/{len(jobs)} PDFs")
+
+    rows.sort(key=lambda row: row['path'])
+    write_cache(cache_path, rows, config)
+
+    failed = sum(1 for row in rows if row['error'] or not row['Resume_str'])
+    summary = {
+        'files': len(rows),
+        'extracted': len(jobs),
+        'reused': len(rows) - len(jobs),
+        'removed': len(set(cached) - {row['sha256'] for row in rows}),
+        'failed': failed,
+        'seconds': round(time.perf_counter() - started, 2),
+        'cache_path': cache_path
+    }
+    print(f"✅ Corpus cache written: {summary}")
+    return summary
+
+
+def load_corpus_cache(cache_path=DEFAULT_CACHE_PATH, include_failed=False):
+    """Read the cache as a DataFrame with ID, Category and Resume_str columns"""
+    import pandas as pd
+
+    df = pd.read_parquet(cache_path, columns=['ID', 'Category', 'Resume_str', 'error'])
+    if not include_failed:
+        df = df[df['error'].isna() & (df['Resume_str'].str.len() > 0)]
+    return df.drop(columns=['error']).reset_index(drop=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract the PDF corpus into the training cache")
+    parser.add_argument('--corpus', default=DEFAULT_CORPUS_DIR, help="Directory with one folder per category")
+    parser.add_argument('--output', default=DEFAULT_CACHE_PATH, help="Parquet cache file")
+    parser.add_argument('--workers', type=int, default=None, help="Extraction processes (default: CPU count)")
+    parser.add_argument('--backend', default=None, help="PDF backend (default: RESUME_PDF_BACKEND or pypdf)")
+    parser.add_argument('--max-pages', type=int, default=None)
+    parser.add_argument('--max-chars', type=int, default=None)
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.corpus):
+        print(f"❌ Corpus directory not found: {args.corpus}")
+        sys.exit(1)
+
+    build_corpus_cache(args.corpus, args.output, args.workers, args.backend, args.max_pages, args.max_chars)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,9 +1,11 @@
-import pandas as pd
 import os
 import re
+from corpus_cache import DEFAULT_CACHE_PATH, USE_CORPUS_CACHE, load_corpus_cache
+from near_duplicates import NEAR_DUPLICATE_THRESHOLD, MinHasher, find_near_duplicates
 
 class DataLoader:
-    def __init__(self):
+    def __init__(self, use_corpus_cache=None):
+        self.use_corpus_cache = USE_CORPUS_CACHE if use_corpus_cache is None else use_corpus_cache
         self.data_paths = [
             'data/Resume.csv',
             '../data/Resume.csv',
@@ -13,6 +15,17 @@ class DataLoader:
     def load_dataset(self):
         """Load the 2400+ resume dataset from Kaggle"""
         print("🔍 Loading resume dataset...")
+        import pandas as pd
+        
+        # Text extracted from dataset/data/category PDFs by corpus_cache.py
+        if self._corpus_cache_selected():
+            print(f"✅ Using corpus cache at: {DEFAULT_CACHE_PATH}")
+            try:
+                df = load_corpus_cache(DEFAULT_CACHE_PATH)
+                print(f"📊 Successfully loaded {len(df)} resumes")
+                return self._preprocess_data(df)
+            except Exception as e:
+                print(f"❌ Error loading {DEFAULT_CACHE_PATH}: {e}")
         
         for path in self.data_paths:
             if os.path.exists(path):
@@ -28,11 +41,40 @@ class DataLoader:
         print("⚠️ No dataset found. Using comprehensive sample data...")
         return self._create_comprehensive_sample_data()
     
-    def _preprocess_data(self, df):
-        """Preprocess the loaded dataset"""
-        print("🔄 Preprocessing dataset...")
+    def iter_dataset(self, chunk_size=5000):
+        """Yield the dataset as domain/resume_text DataFrames of up to chunk_size rows, never all at once"""
+        import pandas as pd
+        
+        if self._corpus_cache_selected():
+            import pyarrow.parquet as pq
+            parquet_file = pq.ParquetFile(DEFAULT_CACHE_PATH)
+            for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=['Category', 'Resume_str', 'error']):
+                df = batch.to_pandas()
+                df = df[df['error'].isna() & (df['Resume_str'].str.len() > 0)]
+                yield self._clean_chunk(self._standardize_columns(df))
+            return
         
-        # Standardize column names
+        for path in self.data_paths:
+            if os.path.exists(path):
+                for df in pd.read_csv(path, chunksize=chunk_size):
+                    yield self._clean_chunk(self._standardize_columns(df))
+                return
+        
+        yield self._create_comprehensive_sample_data()
+    
+    def _corpus_cache_selected(self):
+        """Whether to read the PDF corpus cache; it is never picked up just because it exists"""
+        if not self.use_corpus_cache:
+            if os.path.exists(DEFAULT_CACHE_PATH):
+                print(f"ℹ️ Ignoring corpus cache at {DEFAULT_CACHE_PATH} (set RESUME_USE_CORPUS_CACHE=1 to use it)")
+            return False
+        if not os.path.exists(DEFAULT_CACHE_PATH):
+            print(f"⚠️ RESUME_USE_CORPUS_CACHE is set but {DEFAULT_CACHE_PATH} does not exist")
+            return False
+        return True
+    
+    def _standardize_columns(self, df):
+        """domain/resume_text columns from the Kaggle-style Category/Resume_str (or Resume) columns"""
         if 'Category' in df.columns and 'Resume_str' in df.columns:
             df = df[['Category', 'Resume_str']].copy()
             df.columns = ['domain', 'resume_text']
@@ -44,11 +86,33 @@ class DataLoader:
             resume_col = [col for col in df.columns if 'resume' in col.lower()][0]
             df = df[[category_col, resume_col]].copy()
             df.columns = ['domain', 'resume_text']
-        
-        # Clean data
+        return df
+    
+    def _clean_chunk(self, df):
         df = df.dropna()
         df = df.drop_duplicates()
         df['domain'] = df['domain'].str.upper().str.strip()
+        return df
+    
+    def _drop_near_duplicates(self, df, threshold=None):
+        """Keep the first of each group of resumes whose shingle sets overlap at least threshold (Jaccard)"""
+        threshold = NEAR_DUPLICATE_THRESHOLD if threshold is None else threshold
+        if threshold <= 0 or len(df) < 2:
+            return df
+        
+        duplicate_of = find_near_duplicates(MinHasher().signatures(df['resume_text']), threshold)
+        duplicates = duplicate_of >= 0
+        if duplicates.any():
+            print(f"🧬 Collapsed {int(duplicates.sum())} near-duplicate resumes (Jaccard >= {threshold})")
+        return df[~duplicates]
+    
+    def _preprocess_data(self, df):
+        """Preprocess the loaded dataset"""
+        print("🔄 Preprocessing dataset...")
+        
+        # Standardize column names and clean data
+        df = self._clean_chunk(self._standardize_columns(df))
+        df = self._drop_near_duplicates(df)
         
         print(f"✅ Final dataset: {len(df)} resumes across {df['domain'].nunique()} domains")
         print("📈 Domain distribution:")
@@ -117,6 +181,7 @@ class DataLoader:
                 sample_data['domain'].append(domain)
                 sample_data['resume_text'].append(resume_text)
         
+        import pandas as pd
         df = pd.DataFrame(sample_data)
         print(f"✅ Created sample dataset with {len(df)} resumes across {df['domain'].nunique()} domains")
         return df
\ No newline at end of file
@@ -0,0 +1,65 @@
+import numpy as np
+
+from artifacts import load_artifact, save_artifact
+
+CLASSIFIER_KIND = 'domain_classifier'
+
+
+def hashed_feature_index(term, n_features):
+    """Column HashingVectorizer assigns to term (signed 32-bit MurmurHash3, seed 0)"""
+    from sklearn.utils.murmurhash import murmurhash3_32
+
+    h = murmurhash3_32(term, seed=0)
+    if h == -2147483648:
+        return (2147483647 - (n_features - 1)) % n_features
+    return abs(h) % n_features
+
+
+def save_domain_model(path, vectorizer, classifier, label_encoder, model_info=None, idf_transformer=None):
+    """Persist the fitted TF-IDF vocabulary/idf, Naive Bayes log-probabilities and domain labels"""
+    # A HashingVectorizer has no vocabulary; its idf and tf settings live in idf_transformer
+    hashing = not hasattr(vectorizer, 'vocabulary_')
+    weighting = idf_transformer if hashing else vectorizer
+    arrays = {
+        'idf': np.asarray(weighting.idf_, dtype=np.float64),
+        'stop_words': np.array(sorted(vectorizer.get_stop_words() or ()), dtype=str),
+        'feature_log_prob': np.asarray(classifier.feature_log_prob_, dtype=np.float64),
+        'class_log_prior': np.asarray(classifier.class_log_prior_, dtype=np.float64),
+        'classes': np.array(label_encoder.classes_, dtype=str)
+    }
+    if not hashing:
+        arrays['vocabulary_terms'] = np.array(vectorizer.get_feature_names_out(), dtype=str)
+    metadata = {
+        # Analyzer settings the token-based scorer has to reproduce
+        'ngram_range': list(vectorizer.ngram_range),
+        'sublinear_tf': bool(weighting.sublinear_tf),
+        'norm': weighting.norm,
+        'n_features': int(vectorizer.n_features) if hashing else None,
+        'model_info': model_info or {}
+    }
+    return save_artifact(path, CLASSIFIER_KIND, arrays, metadata)
+
+
+def load_domain_model(path, mmap=True, verify=False):
+    """Scoring state of a saved domain classifier; the numeric arrays stay memory-mapped"""
+    arrays, manifest = load_artifact(path, CLASSIFIER_KIND, mmap=mmap, verify=verify)
+    metadata = manifest['metadata']
+    if metadata.get('norm') != 'l2':
+        raise ValueError(f"Unsupported TF-IDF norm in {path}: {metadata.get('norm')}")
+
+    vocabulary = None
+    if 'vocabulary_terms' in arrays:
+        vocabulary = {term: idx for idx, term in enumerate(arrays['vocabulary_terms'].tolist())}
+
+    state = {
+        'vocabulary': vocabulary,
+        'n_features': metadata.get('n_features'),
+        'stop_words': frozenset(arrays['stop_words'].tolist()),
+        'ngram_range': tuple(metadata['ngram_range']),
+        'sublinear_tf': metadata['sublinear_tf'],
+        'idf': arrays['idf'],
+        'feature_log_prob': arrays['feature_log_prob'],
+        'class_log_prior': arrays['class_log_prior'],
+        'domain_names': np.array(arrays['classes'].tolist(), dtype=object)
+    }
+    return state, manifest
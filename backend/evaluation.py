@@ -0,0 +1,169 @@
+"""Chunked, multi-process evaluation of the job role matcher.
+
+Workers clean and score chunks of resumes with the sparse RoleScorer and
+return only the top-k role indices. The parent turns those into predicted
+domains, top-k accuracy, per-domain accuracy and a confusion matrix with
+array operations.
+"""
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from phrase_matcher import PhraseMatcher
+from role_scorer import RoleScorer
+
+EVALUATION_CHUNK_SIZE = 256
+UNKNOWN_DOMAIN = "Unknown"
+
+HTML_TAG_PATTERN = re.compile(r'<.*?>')
+URL_PATTERN = re.compile(r'http\S+')
+NON_ALPHA_PATTERN = re.compile(r'[^a-zA-Z\s]')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+_scorer = None
+_matcher = None
+_role_keywords = None
+
+
+def clean_resume_text(text):
+    """Lowercase, strip HTML/URLs and keep letters only"""
+    text = str(text).lower()
+    text = HTML_TAG_PATTERN.sub('', text)
+    text = URL_PATTERN.sub('', text)
+    text = NON_ALPHA_PATTERN.sub(' ', text)
+    return WHITESPACE_PATTERN.sub(' ', text).strip()
+
+
+def init_worker(job_role_names, role_keywords, role_domains):
+    """Process pool initializer: build the scorer and phrase matcher once per worker"""
+    global _scorer, _matcher, _role_keywords
+    _scorer = RoleScorer(job_role_names, role_keywords, role_domains)
+    _matcher = PhraseMatcher(keyword for keywords in role_keywords.values() for keyword in keywords)
+    _role_keywords = [role_keywords.get(role_name, []) for role_name in job_role_names]
+
+
+def score_chunk(job):
+    """Top-k role indices, scores and matching keywords for one chunk of raw resume texts"""
+    texts, top_k = job
+    token_lists = [clean_resume_text(text).split() if isinstance(text, str) else [] for text in texts]
+    token_sets = [set(tokens) | _matcher.find_tokens(tokens) for tokens in token_lists]
+
+    scores = _scorer.score(token_sets)
+    top_ids = _scorer.top_k(scores, top_k)
+    top_scores = np.take_along_axis(scores, top_ids, axis=1)
+
+    # Resumes with fewer than 5 words get no prediction, as in predict_top_roles_for_resume
+    valid = np.fromiter((len(tokens) >= 5 for tokens in token_lists), dtype=bool, count=len(texts))
+    top_ids[~valid] = -1
+
+    matching_keywords = [
+        [[kw for kw in _role_keywords[role_idx] if kw in token_sets[row]][:5] for role_idx in top_ids[row].tolist()]
+        if valid[row] else []
+        for row in range(len(texts))
+    ]
+    return top_ids, top_scores, matching_keywords
+
+
+def score_resumes(texts, job_role_names, role_keywords, role_domains, top_k=3,
+                  workers=None, chunk_size=EVALUATION_CHUNK_SIZE, progress=None):
+    """Score all texts in chunks, across worker processes when there is more than one chunk"""
+    chunks = [(texts[start:start + chunk_size], top_k) for start in range(0, len(texts), chunk_size)]
+    workers = min(workers or os.cpu_count() or 1, len(chunks))
+    state = (job_role_names, role_keywords, role_domains)
+
+    if workers <= 1:
+        init_worker(*state)
+        results = map(score_chunk, chunks)
+        pool = None
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=state)
+        results = pool.map(score_chunk, chunks)
+
+    try:
+        top_ids, top_scores, matching_keywords = [], [], []
+        for chunk_ids, chunk_scores, chunk_keywords in results:
+            if progress:
+                progress(len(matching_keywords), chunk_ids)
+            top_ids.append(chunk_ids)
+            top_scores.append(chunk_scores)
+            matching_keywords.extend(chunk_keywords)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    if not chunks:
+        return np.empty((0, top_k), dtype=np.int64), np.empty((0, top_k)), []
+    return np.concatenate(top_ids), np.concatenate(top_scores), matching_keywords
+
+
+def vote_domains(top_domain_ids, n_labels, unknown_id):
+    """Most frequent domain among each row's top roles; ties go to the domain ranked first"""
+    n_rows, k = top_domain_ids.shape
+    if k == 0:
+        return np.full(n_rows, unknown_id)
+
+    valid = top_domain_ids >= 0
+    rows = np.repeat(np.arange(n_rows), k)
+    counts = np.zeros((n_rows, n_labels), dtype=np.int64)
+    np.add.at(counts, (rows[valid.ravel()], top_domain_ids[valid]), 1)
+
+    # Winning count of the domain at each rank; the first rank holding the maximum wins
+    rank_counts = np.where(valid, np.take_along_axis(counts, np.where(valid, top_domain_ids, 0), axis=1), -1)
+    winner_rank = np.argmax(rank_counts == rank_counts.max(axis=1, keepdims=True), axis=1)
+    winners = top_domain_ids[np.arange(n_rows), winner_rank]
+    return np.where(valid.any(axis=1), winners, unknown_id)
+
+
+def evaluate_predictions(top_role_ids, role_domain_ids, domains, true_domains, k_values=(1, 2, 3)):
+    """Accuracy, top-k accuracy, per-domain accuracy and confusion matrix from top role indices"""
+    true_domains = np.asarray(true_domains, dtype=object)
+
+    # Label space: catalog domains, any extra true labels, then Unknown
+    labels = list(domains)
+    label_ids = {label: idx for idx, label in enumerate(labels)}
+    for label in dict.fromkeys(true_domains.tolist()):
+        if label not in label_ids:
+            label_ids[label] = len(labels)
+            labels.append(label)
+    if UNKNOWN_DOMAIN not in label_ids:
+        label_ids[UNKNOWN_DOMAIN] = len(labels)
+        labels.append(UNKNOWN_DOMAIN)
+    n_labels = len(labels)
+
+    true_ids = np.fromiter((label_ids[label] for label in true_domains.tolist()), dtype=np.int64,
+                           count=len(true_domains))
+    top_domain_ids = np.where(top_role_ids >= 0, np.asarray(role_domain_ids)[np.maximum(top_role_ids, 0)], -1)
+    predicted_ids = vote_domains(top_domain_ids, n_labels, label_ids[UNKNOWN_DOMAIN])
+    correct = predicted_ids == true_ids
+    total = len(true_ids)
+
+    top_k_results = {}
+    for k in k_values:
+        hits = int(np.any(top_domain_ids[:, :k] == true_ids[:, None], axis=1).sum()) if total else 0
+        top_k_results[f'top_{k}'] = {'accuracy': hits / total if total else 0.0, 'correct': hits, 'total': total}
+
+    domain_correct = np.bincount(true_ids, weights=correct, minlength=n_labels).astype(np.int64)
+    domain_total = np.bincount(true_ids, minlength=n_labels)
+
+    # Domains in order of first appearance, matching the row-by-row tally
+    _, first_rows = np.unique(true_ids, return_index=True)
+    domain_accuracy = {}
+    for label_id in true_ids[np.sort(first_rows)].tolist():
+        domain_accuracy[labels[label_id]] = {
+            'accuracy': float(domain_correct[label_id] / domain_total[label_id]),
+            'correct': int(domain_correct[label_id]),
+            'total': int(domain_total[label_id])
+        }
+
+    confusion = np.bincount(true_ids * n_labels + predicted_ids, minlength=n_labels * n_labels)
+    return {
+        'overall_accuracy': float(correct.mean()) if total else 0.0,
+        'domain_accuracy': domain_accuracy,
+        'top_k_results': top_k_results,
+        'predicted_domains': [labels[label_id] for label_id in predicted_ids.tolist()],
+        'correct': correct,
+        'labels': labels,
+        'confusion_matrix': confusion.reshape(n_labels, n_labels)
+    }
@@ -0,0 +1,233 @@
+"""Cross-validated hyperparameter sweep for SmartHireModel's TF-IDF + Naive Bayes classifier.
+
+The corpus is cleaned and tokenized once into a single count matrix at the
+widest n-gram range; each n-gram setting is a column subset of it. Workers
+then rebuild the vocabulary (min_df/max_df/max_features), idf and TF-IDF
+rows per training fold from those counts the way TfidfVectorizer.fit
+would, and fit one MultinomialNB per alpha. Folds x vectorizer settings run
+across processes. Reported fit/predict times exclude the shared tokenization.
+
+Usage (from the backend directory):
+    python hyperparameter_sweep.py --folds 5 --max-features 1000 2500 5000 --alphas 0.01 0.1 1
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from model import DOMAIN_NB_ALPHA, DOMAIN_VECTORIZER_PARAMS, SmartHireModel
+
+_counts = None
+_labels = None
+
+
+def parse_ngram_range(value):
+    """'1,2' -> (1, 2)"""
+    low, high = (int(part) for part in value.split(','))
+    return low, high
+
+
+def build_count_matrices(cleaned_texts, ngram_ranges, min_df):
+    """Count matrix per n-gram range, all sliced from one tokenization pass"""
+    from sklearn.feature_extraction.text import CountVectorizer
+
+    widest = (min(low for low, _ in ngram_ranges), max(high for _, high in ngram_ranges))
+    # Terms below the smallest min_df over the whole corpus cannot reach it within a fold either
+    vectorizer = CountVectorizer(stop_words=DOMAIN_VECTORIZER_PARAMS['stop_words'], ngram_range=widest,
+                                 min_df=min_df)
+    counts = vectorizer.fit_transform(cleaned_texts).tocsc()
+    term_lengths = np.array([term.count(' ') + 1 for term in vectorizer.get_feature_names_out()])
+
+    matrices = {}
+    for low, high in ngram_ranges:
+        columns = np.flatnonzero((term_lengths >= low) & (term_lengths <= high))
+        matrices[(low, high)] = counts[:, columns].tocsr()
+    return matrices
+
+
+def tfidf_rows(counts, idf, sublinear_tf):
+    """TF-IDF weighting and l2 normalization of count rows, as TfidfVectorizer.transform does"""
+    from sklearn.preprocessing import normalize
+
+    weighted = counts.astype(np.float64)
+    if sublinear_tf:
+        weighted.data = np.log(weighted.data) + 1
+    weighted.data *= idf[weighted.indices]
+    return normalize(weighted)
+
+
+def init_worker(counts, labels):
+    """Process pool initializer: the cached count matrices and labels, shipped once per worker"""
+    global _counts, _labels
+    _counts = counts
+    _labels = labels
+
+
+def evaluate_fold(job):
+    """Fit and score every alpha for one vectorizer setting on one fold"""
+    from sklearn.naive_bayes import MultinomialNB
+
+    ngram_range, max_features, min_df, max_df, sublinear_tf, alphas, train_idx, test_idx = job
+    counts = _counts[ngram_range]
+
+    # Vocabulary and idf from the training fold only
+    started = time.perf_counter()
+    train_counts = counts[train_idx]
+    n_docs = len(train_idx)
+    document_freq = np.bincount(train_counts.indices, minlength=counts.shape[1])
+    max_doc_count = max_df if isinstance(max_df, int) else max_df * n_docs
+    min_doc_count = min_df if isinstance(min_df, int) else min_df * n_docs
+    columns = np.flatnonzero((document_freq >= min_doc_count) & (document_freq <= max_doc_count))
+    if max_features and len(columns) > max_features:
+        # Same float64 totals and default (unstable) argsort as CountVectorizer._limit_features, so ties
+        # between equally frequent terms are broken exactly as TfidfVectorizer breaks them
+        term_freq = np.asarray(train_counts[:, columns].astype(np.float64).sum(axis=0)).ravel()
+        columns = np.sort(columns[(-term_freq).argsort()[:max_features]])
+    idf = np.log((1 + n_docs) / (1 + document_freq[columns])) + 1
+    X_train = tfidf_rows(train_counts[:, columns], idf, sublinear_tf)
+    vectorize_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    X_test = tfidf_rows(counts[test_idx][:, columns], idf, sublinear_tf)
+    transform_seconds = time.perf_counter() - started
+
+    results = []
+    for alpha in alphas:
+        started = time.perf_counter()
+        classifier = MultinomialNB(alpha=alpha).fit(X_train, _labels[train_idx])
+        fit_seconds = vectorize_seconds + time.perf_counter() - started
+
+        started = time.perf_counter()
+        predicted = classifier.predict(X_test)
+        predict_seconds = transform_seconds + time.perf_counter() - started
+
+        results.append({
+            'ngram_range': list(ngram_range),
+            'max_features': max_features,
+            'alpha': alpha,
+            'accuracy': float(np.mean(predicted == _labels[test_idx])),
+            'fit_seconds': fit_seconds,
+            'predict_seconds': predict_seconds,
+            'test_size': len(test_idx),
+            'features': len(columns)
+        })
+    return results
+
+
+def summarize(fold_results):
+    """Mean/std accuracy and timings per config, flagging configs no other config beats on both"""
+    grouped = {}
+    for result in fold_results:
+        key = (tuple(result['ngram_range']), result['max_features'], result['alpha'])
+        grouped.setdefault(key, []).append(result)
+
+    summary = []
+    for (ngram_range, max_features, alpha), results in grouped.items():
+        accuracies = np.array([result['accuracy'] for result in results])
+        test_docs = sum(result['test_size'] for result in results)
+        summary.append({
+            'ngram_range': list(ngram_range),
+            'max_features': max_features,
+            'alpha': alpha,
+            'accuracy_mean': round(float(accuracies.mean()), 4),
+            'accuracy_std': round(float(accuracies.std()), 4),
+            'fit_ms': round(1000 * float(np.mean([result['fit_seconds'] for result in results])), 2),
+            'predict_ms_per_1k': round(1e6 * sum(result['predict_seconds'] for result in results) / test_docs, 2),
+            'features': int(np.mean([result['features'] for result in results])),
+            'folds': len(results)
+        })
+
+    # Pareto front over accuracy (higher is better) and fit + predict time (lower is better)
+    for config in summary:
+        cost = config['fit_ms'] + config['predict_ms_per_1k']
+        config['pareto'] = not any(
+            other['accuracy_mean'] >= config['accuracy_mean'] and other['fit_ms'] + other['predict_ms_per_1k'] <= cost
+            and (other['accuracy_mean'], other['fit_ms'] + other['predict_ms_per_1k']) != (config['accuracy_mean'], cost)
+            for other in summary
+        )
+    return sorted(summary, key=lambda config: (-config['accuracy_mean'], config['fit_ms']))
+
+
+def run_sweep(df, ngram_ranges, max_features_values, alphas, folds=5, workers=None, seed=42):
+    """Cross-validate every ngram_range x max_features x alpha combination on a domain/resume_text DataFrame"""
+    from sklearn.model_selection import StratifiedKFold
+    from sklearn.preprocessing import LabelEncoder
+
+    started = time.perf_counter()
+    model = SmartHireModel()
+    cleaned_texts = df['resume_text'].map(model.clean_text).tolist()
+    labels = LabelEncoder().fit_transform(df['domain'])
+    min_df = DOMAIN_VECTORIZER_PARAMS['min_df']
+    counts = build_count_matrices(cleaned_texts, ngram_ranges, min_df if isinstance(min_df, int) else 1)
+    print(f"🧮 Cleaned, tokenized and counted {len(cleaned_texts)} resumes in {time.perf_counter() - started:.1f}s")
+
+    splits = list(StratifiedKFold(n_splits=folds, shuffle=True, random_state=seed).split(cleaned_texts, labels))
+    jobs = [
+        (ngram_range, max_features, min_df, DOMAIN_VECTORIZER_PARAMS['max_df'],
+         DOMAIN_VECTORIZER_PARAMS['sublinear_tf'], list(alphas), train_idx, test_idx)
+        for ngram_range in ngram_ranges
+        for max_features in max_features_values
+        for train_idx, test_idx in splits
+    ]
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    print(f"🔀 {len(jobs) * len(alphas)} fits ({len(ngram_ranges) * len(max_features_values) * len(alphas)} configs "
+          f"x {folds} folds) on {workers} worker(s)")
+
+    fold_results = []
+    if workers <= 1:
+        init_worker(counts, labels)
+        for results in map(evaluate_fold, jobs):
+            fold_results.extend(results)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(counts, labels)) as pool:
+            for results in pool.map(evaluate_fold, jobs):
+                fold_results.extend(results)
+
+    return {
+        'resumes': len(cleaned_texts),
+        'folds': folds,
+        'workers': workers,
+        'seconds': round(time.perf_counter() - started, 2),
+        'current': {
+            'ngram_range': list(DOMAIN_VECTORIZER_PARAMS['ngram_range']),
+            'max_features': DOMAIN_VECTORIZER_PARAMS['max_features'],
+            'alpha': DOMAIN_NB_ALPHA
+        },
+        'results': summarize(fold_results)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cross-validated sweep of the domain classifier's hyperparameters")
+    parser.add_argument('--folds', type=int, default=5)
+    parser.add_argument('--ngrams', nargs='+', type=parse_ngram_range, default=[(1, 1), (1, 2)],
+                        help="n-gram ranges as low,high")
+    parser.add_argument('--max-features', nargs='+', type=int, default=[1000, 2500, 5000, 10000])
+    parser.add_argument('--alphas', nargs='+', type=float, default=[0.01, 0.05, 0.1, 0.5, 1.0])
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--output', help="Write the sweep results as JSON to this file")
+    args = parser.parse_args()
+
+    df = SmartHireModel().data_loader.load_dataset()
+    report = run_sweep(df, args.ngrams, args.max_features, args.alphas, args.folds, args.workers)
+
+    print(f"\n✅ Sweep finished in {report['seconds']}s (current: {report['current']})")
+    print(f"{'ngrams':<8} {'max_feat':>8} {'alpha':>6} {'accuracy':>15} {'fit ms':>9} {'pred ms/1k':>11}")
+    for config in report['results']:
+        marker = ' ⭐' if config['pareto'] else ''
+        print(f"{'%d,%d' % tuple(config['ngram_range']):<8} {config['max_features']:>8} {config['alpha']:>6} "
+              f"{config['accuracy_mean']:>8.4f} ±{config['accuracy_std']:.4f} {config['fit_ms']:>9.1f} "
+              f"{config['predict_ms_per_1k']:>11.1f}{marker}")
+    print("⭐ = no other config is both at least as accurate and faster")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"📊 Results saved to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+import numpy as np
+
+from artifacts import content_hash, load_artifact, read_manifest, save_artifact
+
+CATALOG_KIND = 'job_catalog'
+
+
+def job_structure_hash(job_structure):
+    """Hash of the domain -> role -> keywords structure, order included"""
+    return content_hash([
+        [domain, [[role_name, list(keywords)] for role_name, keywords in roles.items()]]
+        for domain, roles in job_structure.items()
+    ])
+
+
+def vectorizer_params(vectorizer):
+    """The TfidfVectorizer settings needed to rebuild it from vocabulary and idf"""
+    return normalize_vectorizer_params({
+        'max_features': vectorizer.max_features,
+        'stop_words': vectorizer.stop_words,
+        'ngram_range': vectorizer.ngram_range
+    })
+
+
+def normalize_vectorizer_params(params):
+    """JSON-comparable copy of vectorizer settings"""
+    return dict(params, ngram_range=list(params['ngram_range']))
+
+
+def build_vectorizer(params, terms=None, idf=None):
+    """Create a TfidfVectorizer, already fitted when vocabulary terms and idf are given"""
+    # Imported here so serving processes only pay for scikit-learn when a vectorizer is used
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    vectorizer = TfidfVectorizer(
+        max_features=params['max_features'],
+        stop_words=params['stop_words'],
+        ngram_range=tuple(params['ngram_range'])
+    )
+    if terms is not None:
+        vectorizer.vocabulary_ = {term: idx for idx, term in enumerate(np.asarray(terms).tolist())}
+        vectorizer.idf_ = idf
+    return vectorizer
+
+
+def save_job_catalog(path, job_structure, vectorizer):
+    """Compile the job structure and fitted vectorizer into an artifact at path"""
+    domains = list(job_structure.keys())
+    role_names, role_domain_ids = [], []
+    keyword_ids = {}
+    indptr, indices = [0], []
+
+    for domain_id, (domain, roles) in enumerate(job_structure.items()):
+        for role_name, keywords in roles.items():
+            role_names.append(role_name)
+            role_domain_ids.append(domain_id)
+            indices.extend(keyword_ids.setdefault(keyword, len(keyword_ids)) for keyword in keywords)
+            indptr.append(len(indices))
+
+    feature_names = vectorizer.get_feature_names_out()
+    arrays = {
+        'domains': np.array(domains, dtype=str),
+        'role_names': np.array(role_names, dtype=str),
+        'role_domain_ids': np.array(role_domain_ids, dtype=np.int32),
+        'keywords': np.array(list(keyword_ids), dtype=str),
+        'role_keyword_indptr': np.array(indptr, dtype=np.int64),
+        'role_keyword_ids': np.array(indices, dtype=np.int32),
+        'vectorizer_terms': np.array(feature_names, dtype=str),
+        'vectorizer_idf': np.asarray(vectorizer.idf_, dtype=np.float64)
+    }
+    metadata = {
+        'job_structure_hash': job_structure_hash(job_structure),
+        'vectorizer_params': vectorizer_params(vectorizer)
+    }
+    return save_artifact(path, CATALOG_KIND, arrays, metadata)
+
+
+def load_job_catalog(path, mmap=True, verify=False):
+    """Rebuild the job structure and the vectorizer state from an artifact without refitting"""
+    arrays, manifest = load_artifact(path, CATALOG_KIND, mmap=mmap, verify=verify)
+
+    domains = arrays['domains'].tolist()
+    keywords = arrays['keywords'].tolist()
+    indptr = arrays['role_keyword_indptr'].tolist()
+    keyword_ids = arrays['role_keyword_ids'].tolist()
+
+    job_structure = {domain: {} for domain in domains}
+    for role_idx, (role_name, domain_id) in enumerate(zip(arrays['role_names'].tolist(),
+                                                           arrays['role_domain_ids'].tolist())):
+        role_keywords = [keywords[i] for i in keyword_ids[indptr[role_idx]:indptr[role_idx + 1]]]
+        job_structure[domains[domain_id]][role_name] = role_keywords
+
+    # Passed to build_vectorizer on first use
+    vectorizer_state = {
+        'params': manifest['metadata']['vectorizer_params'],
+        'terms': arrays['vectorizer_terms'],
+        'idf': arrays['vectorizer_idf']
+    }
+
+    return job_structure, vectorizer_state, manifest
+
+
+def catalog_is_current(path, job_structure, params):
+    """True when the artifact at path was compiled from this job structure and vectorizer config"""
+    manifest = read_manifest(path)
+    if manifest is None or manifest.get('kind') != CATALOG_KIND:
+        return False
+
+    metadata = manifest.get('metadata', {})
+    return (metadata.get('job_structure_hash') == job_structure_hash(job_structure)
+            and metadata.get('vectorizer_params') == normalize_vectorizer_params(params))
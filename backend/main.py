@@ -1,18 +1,49 @@
-from flask import Flask, request, jsonify
-import pandas as pd
-import numpy as np
-import pickle
+from flask import Flask, request, jsonify, Response, stream_with_context, g, make_response, send_file
 import os
 import re
 import json
-from sklearn.feature_extraction.text import TfidfVectorizer
+import math
+import sys
+import argparse
+import threading
+import time
 from collections import defaultdict
-import nltk
 import warnings
+from functools import wraps
 from flask_cors import CORS
+from phrase_matcher import PhraseMatcher
+from artifacts import read_manifest
+from job_catalog import save_job_catalog, load_job_catalog, catalog_is_current, build_vectorizer
+from result_cache import ResultCache, cache_key
+from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, ServiceMetrics
+import profiling
 
 warnings.filterwarnings('ignore')
 
+# Compiled job catalog artifact written by train.py or on first start
+DEFAULT_MODEL_PATH = os.environ.get(
+    'JOB_MODEL_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models', 'job_catalog')
+)
+
+# TF-IDF settings for the role description vectorizer
+VECTORIZER_PARAMS = {'max_features': 5000, 'stop_words': 'english', 'ngram_range': (1, 2)}
+
+# Resumes scored together per vectorized pass of /predict/batch
+BATCH_CHUNK_SIZE = 256
+
+# JSON array bodies of /predict/batch are parsed whole, so they are capped; NDJSON bodies stream and are not
+BATCH_JSON_MAX_BYTES = int(os.environ.get('JOB_BATCH_JSON_MAX_BYTES', 8 * 1024 * 1024))
+
+# Seconds between checks of the artifact for a new catalog; 0 disables the watcher
+MODEL_WATCH_SECONDS = float(os.environ.get('JOB_MODEL_WATCH_SECONDS', 0))
+
+# Largest top_k /search/candidates serves
+MAX_CANDIDATE_RESULTS = 500
+
+# Scored once by a freshly loaded system so its lazily built parts exist before it serves
+WARMUP_RESUME = "Python developer with machine learning, SQL and project management experience"
+
 # Initialize Flask app
 app = Flask(__name__)
 CORS(app)
@@ -22,27 +53,33 @@ class CompleteJobRoleSystem:
         self.job_roles_data = {}
         self.domain_to_roles = {}
         self.role_keywords = {}
-        self.vectorizer = TfidfVectorizer(max_features=5000, stop_words='english', ngram_range=(1, 2))
+        self._vectorizer = None
+        self._vectorizer_state = None
         self.job_role_texts = []
         self.job_role_names = []
+        self.role_domains = []
+        self.role_keyword_counts = []
+        self.keyword_to_roles = {}
+        self.role_scorer = None
+        self.keyword_matcher = None
         self.results = []
         self.explainer = None
         self.feature_names = None
         self.use_lime = False
+        self.model_version = None
     
-    def ensure_nltk_data(self):
-        """Ensure NLTK data is available"""
-        try:
-            nltk.data.find('tokenizers/punkt')
-        except LookupError:
-            print("📥 Downloading NLTK punkt...")
-            nltk.download('punkt', quiet=True)
-        
-        try:
-            nltk.data.find('corpora/stopwords')
-        except LookupError:
-            print("📥 Downloading NLTK stopwords...")
-            nltk.download('stopwords', quiet=True)
+    @property
+    def vectorizer(self):
+        """TF-IDF vectorizer, only materialized (and scikit-learn imported) on first use"""
+        if self._vectorizer is None:
+            state = self._vectorizer_state or {'params': VECTORIZER_PARAMS}
+            self._vectorizer = build_vectorizer(**state)
+        return self._vectorizer
+
+    @vectorizer.setter
+    def vectorizer(self, vectorizer):
+        self._vectorizer = vectorizer
+        self._vectorizer_state = None
 
     def define_complete_job_structure(self):
         """Define all job roles with proper list format for all domains"""
@@ -337,7 +374,11 @@ class CompleteJobRoleSystem:
         }
     }
         
-        # Build the data structures
+        self.load_job_structure(job_structure)
+        return job_structure
+
+    def load_job_structure(self, job_structure):
+        """Build the role lists, keyword index and scorer from a domain -> role -> keywords mapping"""
         self.job_roles_data = job_structure
         self.domain_to_roles = {}
         self.role_keywords = {}
@@ -353,13 +394,43 @@ class CompleteJobRoleSystem:
                 role_text = f"{role_name} {' '.join(keywords)} {domain}"
                 self.job_role_texts.append(role_text)
         
+        self.build_keyword_index()
+        
         print(f"✅ Defined {len(self.job_role_names)} job roles across {len(self.domain_to_roles)} domains")
-        return job_structure
+
+    def build_keyword_index(self):
+        """Build the keyword -> role postings and role -> domain arrays used for scoring"""
+        # A role name listed under several domains resolves to the first one
+        first_domain = {}
+        for domain, roles in self.domain_to_roles.items():
+            for role_name in roles:
+                first_domain.setdefault(role_name, domain)
+        
+        self.role_domains = [first_domain.get(name) for name in self.job_role_names]
+        self.role_keyword_counts = []
+        self.keyword_to_roles = defaultdict(list)
+        
+        for role_idx, role_name in enumerate(self.job_role_names):
+            unique_keywords = set(self.role_keywords.get(role_name, []))
+            self.role_keyword_counts.append(len(unique_keywords))
+            for keyword in unique_keywords:
+                self.keyword_to_roles[keyword].append(role_idx)
+        
+        self.keyword_to_roles = dict(self.keyword_to_roles)
+        self.keyword_matcher = PhraseMatcher(self.keyword_to_roles)
+        self.role_scorer = None
+
+    def get_role_scorer(self):
+        """Sparse batch scorer, built on first batch request so scipy stays off the startup path"""
+        if self.role_scorer is None:
+            from role_scorer import RoleScorer
+            self.role_scorer = RoleScorer(self.job_role_names, self.role_keywords, self.role_domains)
+        return self.role_scorer
 
     def clean_text(self, text):
         """Clean and preprocess text safely"""
         try:
-            if pd.isna(text) or text is None:
+            if text is None or (isinstance(text, float) and math.isnan(text)):
                 return ""
             
             text = str(text).lower()
@@ -373,19 +444,35 @@ class CompleteJobRoleSystem:
             print(f"⚠️  Text cleaning error: {e}")
             return ""
 
-    def load_complete_model(self, model_path=None):
-        """Complete model loading with comprehensive error handling"""
+    def load_complete_model(self, model_path=None, rebuild=False, fallback=True):
+        """Complete model loading with comprehensive error handling; fallback=False only loads the artifact"""
         try:
+            model_path = model_path or DEFAULT_MODEL_PATH
             print("🔄 Initializing job matching system...")
             
-            # Ensure NLTK data is available
-            self.ensure_nltk_data()
+            if rebuild:
+                self.rebuild_model_artifact(model_path)
             
-            # If no pre-trained model, use the default job structure
-            self.define_complete_job_structure()
+            loaded = False
+            if read_manifest(model_path) is not None:
+                try:
+                    self.load_model_artifact(model_path)
+                    loaded = True
+                except Exception as e:
+                    print(f"⚠️  Could not load model artifact at {model_path}: {e}")
             
-            # Train TF-IDF model
-            self.train_tfidf_model()
+            if not loaded and not fallback:
+                print(f"❌ No loadable model artifact at {model_path}")
+                return False
+            
+            if not loaded:
+                # If no pre-trained model, use the default job structure
+                self.define_complete_job_structure()
+                
+                # Train TF-IDF model
+                self.train_tfidf_model()
+                
+                self.save_model_artifact(model_path)
             
             print(f"✅ System initialized with {len(self.job_role_names)} job roles")
             print(f"✅ Loaded {len(self.domain_to_roles)} domains")
@@ -399,13 +486,44 @@ class CompleteJobRoleSystem:
             traceback.print_exc()
             return False
 
+    def load_model_artifact(self, model_path):
+        """Load the compiled job catalog and vectorizer without refitting anything"""
+        job_structure, vectorizer_state, manifest = load_job_catalog(model_path)
+        self._vectorizer = None
+        self._vectorizer_state = vectorizer_state
+        self.feature_names = vectorizer_state['terms']
+        self.load_job_structure(job_structure)
+        self.model_version = manifest['content_hash']
+        print(f"📦 Loaded model artifact {self.model_version[:12]} from {model_path}")
+
+    def save_model_artifact(self, model_path):
+        """Persist the compiled job catalog so the next start only has to open it"""
+        try:
+            manifest = save_job_catalog(model_path, self.job_roles_data, self.vectorizer)
+            self.model_version = manifest['content_hash']
+            print(f"💾 Model artifact {self.model_version[:12]} saved to {model_path}")
+        except Exception as e:
+            print(f"⚠️  Could not save model artifact to {model_path}: {e}")
+
+    def rebuild_model_artifact(self, model_path):
+        """Recompile the artifact only if the job structure or vectorizer settings changed"""
+        job_structure = self.define_complete_job_structure()
+        if catalog_is_current(model_path, job_structure, VECTORIZER_PARAMS):
+            print(f"✅ Model artifact at {model_path} is up to date")
+            return False
+        
+        print(f"🔄 Job structure changed, rebuilding model artifact at {model_path}")
+        self.train_tfidf_model()
+        self.save_model_artifact(model_path)
+        return True
+
     def validate_loaded_model(self):
         """Validate that all required model components are loaded"""
         required_components = {
             'job_role_names': self.job_role_names,
             'role_keywords': self.role_keywords,
             'domain_to_roles': self.domain_to_roles,
-            'vectorizer': self.vectorizer
+            'vectorizer': self._vectorizer is not None or self._vectorizer_state is not None
         }
         
         for name, component in required_components.items():
@@ -436,13 +554,20 @@ class CompleteJobRoleSystem:
             print(f"❌ Error training TF-IDF model: {e}")
             raise
 
+    def extract_resume_terms(self, resume_text):
+        """Resume words plus every catalog keyword phrase found in the text"""
+        resume_terms = set(resume_text.lower().split())
+        if self.keyword_matcher is not None:
+            resume_terms.update(self.keyword_matcher.find(resume_text))
+        return resume_terms
+
     def calculate_keyword_match_score(self, resume_text, job_keywords):
         """Calculate match score based on keyword overlap safely"""
         try:
             if not resume_text or not job_keywords:
                 return 0.0
             
-            resume_words = set(resume_text.lower().split())
+            resume_words = self.extract_resume_terms(resume_text)
             job_words = set(job_keywords)
             
             if not job_words:
@@ -469,58 +594,130 @@ class CompleteJobRoleSystem:
             print(f"⚠️  Match score calculation error: {e}")
             return 0.0
 
+    def score_roles(self, resume_terms, keyword_hits):
+        """Score only the roles sharing at least one keyword with the resume"""
+        matched = defaultdict(list)
+        for keyword in keyword_hits:
+            for role_idx in self.keyword_to_roles.get(keyword, ()):
+                matched[role_idx].append(keyword)
+        
+        resume_size = len(resume_terms)
+        scores = {}
+        for role_idx, hits in matched.items():
+            job_size = self.role_keyword_counts[role_idx]
+            intersection = len(hits)
+            union = resume_size + job_size - intersection
+            
+            # Same Jaccard + coverage blend as calculate_keyword_match_score
+            jaccard_similarity = intersection / union
+            keyword_coverage = intersection / job_size
+            combined_score = (jaccard_similarity * 0.4) + (keyword_coverage * 0.6)
+            scores[role_idx] = min(combined_score, 1.0)
+        
+        return scores, matched
+
+    def rank_roles(self, cleaned_resume):
+        """Full role ranking for a cleaned resume, or None if it is too short to score"""
+        resume_words = cleaned_resume.split()
+        if not cleaned_resume or len(resume_words) < 5:
+            return None
+        
+        # One automaton pass finds every single- and multi-word keyword
+        keyword_hits = self.keyword_matcher.find_tokens(resume_words)
+        resume_terms = set(resume_words) | keyword_hits
+        
+        # Only roles reachable through the keyword index can score above zero
+        scores, matched = self.score_roles(resume_terms, keyword_hits)
+        ranked = sorted(scores, key=lambda idx: (-round(scores[idx] * 100, 2), idx))
+        
+        return {
+            'ranked': ranked,
+            'scores': scores,
+            'matched': {role_idx: set(hits) for role_idx, hits in matched.items()},
+            'resume_terms': resume_terms,
+            'explanations': {}
+        }
+
+    def roles_from_ranking(self, cleaned_resume, ranking, top_k=3):
+        """Top K roles with explanations and the predicted domain from a rank_roles result"""
+        if ranking is None:
+            return [], "Unknown"
+        
+        scores = ranking['scores']
+        ranked = ranking['ranked'][:top_k]
+        
+        # Pad with zero-score roles in catalog order, as the full scan would
+        if len(ranked) < top_k:
+            for role_idx in range(len(self.job_role_names)):
+                if len(ranked) >= top_k:
+                    break
+                if role_idx not in scores:
+                    ranked.append(role_idx)
+        
+        top_roles = []
+        for role_idx in ranked:
+            role_name = self.job_role_names[role_idx]
+            hits = ranking['matched'].get(role_idx, ())
+            
+            # Explanations are memoized on the ranking so cached rankings reuse them
+            explanation = ranking['explanations'].get(role_idx)
+            if explanation is None:
+                explanation = self.explain_prediction(cleaned_resume, role_idx, ranking['resume_terms'])
+                ranking['explanations'][role_idx] = explanation
+            
+            top_roles.append({
+                'job_role': role_name,
+                'domain': self.role_domains[role_idx],
+                'match_score': round(scores.get(role_idx, 0.0) * 100, 2),
+                'matching_keywords': [kw for kw in self.role_keywords.get(role_name, []) if kw in hits][:5],
+                'role_index': role_idx,
+                'explanation': explanation
+            })
+        
+        # Predict domain from top roles
+        return top_roles, self.predict_domain_from_roles(top_roles)
+
     def predict_top_roles_for_resume(self, resume_text, top_k=3):
         """Predict top job roles for a single resume safely"""
         try:
             cleaned_resume = self.clean_text(resume_text)
+            return self.roles_from_ranking(cleaned_resume, self.rank_roles(cleaned_resume), top_k)
             
-            if not cleaned_resume or len(cleaned_resume.split()) < 5:
-                return [], "Unknown"
-            
-            # Calculate match scores for all job roles
-            match_scores = []
+        except Exception as e:
+            print(f"⚠️  Prediction error: {e}")
+            return [], "Unknown"
+
+    def predict_top_roles_batch(self, texts, top_k=3):
+        """Predict top job roles for many resumes with one vectorized scoring pass"""
+        cleaned_texts = [self.clean_text(text) for text in texts]
+        token_lists = [cleaned.split() for cleaned in cleaned_texts]
+        token_sets = [set(tokens) | self.keyword_matcher.find_tokens(tokens) for tokens in token_lists]
+        
+        role_scorer = self.get_role_scorer()
+        scores = role_scorer.score(token_sets)
+        top_indices = role_scorer.top_k(scores, top_k)
+        
+        predictions = []
+        for row, cleaned_resume in enumerate(cleaned_texts):
+            if not cleaned_resume or len(token_lists[row]) < 5:
+                predictions.append(([], "Unknown"))
+                continue
             
-            for role_idx, role_name in enumerate(self.job_role_names):
-                job_keywords = self.role_keywords.get(role_name, [])
-                match_score = self.calculate_keyword_match_score(cleaned_resume, job_keywords)
-                
-                # Find domain for this role
-                domain = None
-                for dom, roles in self.domain_to_roles.items():
-                    if role_name in roles:
-                        domain = dom
-                        break
-                
-                # Get matching keywords (actual matches)
-                resume_words = set(cleaned_resume.split())
-                job_keyword_set = set(job_keywords)
-                matching_keywords = list(resume_words.intersection(job_keyword_set))[:5]
-                
-                match_scores.append({
+            top_roles = []
+            for role_idx in top_indices[row].tolist():
+                role_name = self.job_role_names[role_idx]
+                top_roles.append({
                     'job_role': role_name,
-                    'domain': domain,
-                    'match_score': round(match_score * 100, 2),
-                    'matching_keywords': matching_keywords,
-                    'role_index': role_idx
+                    'domain': self.role_domains[role_idx],
+                    'match_score': round(float(scores[row, role_idx]) * 100, 2),
+                    'matching_keywords': [kw for kw in self.role_keywords.get(role_name, []) if kw in token_sets[row]][:5],
+                    'role_index': role_idx,
+                    'explanation': self.explain_prediction(cleaned_resume, role_idx, token_sets[row])
                 })
             
-            # Sort by match score and get top K
-            match_scores.sort(key=lambda x: x['match_score'], reverse=True)
-            top_roles = match_scores[:top_k]
-            
-            # Generate explanations for top roles
-            for role in top_roles:
-                explanation = self.explain_prediction(cleaned_resume, role['role_index'])
-                role['explanation'] = explanation
-            
-            # Predict domain from top roles
-            predicted_domain = self.predict_domain_from_roles(top_roles)
-            
-            return top_roles, predicted_domain
-            
-        except Exception as e:
-            print(f"⚠️  Prediction error: {e}")
-            return [], "Unknown"
+            predictions.append((top_roles, self.predict_domain_from_roles(top_roles)))
+        
+        return predictions
 
     def predict_domain_from_roles(self, top_roles):
         """Predict domain based on top job roles safely"""
@@ -560,22 +757,22 @@ class CompleteJobRoleSystem:
             'domain': next((dom for dom, roles in self.domain_to_roles.items() if role_name in roles), None)
         }
 
-    def explain_prediction(self, resume_text, top_role_index):
+    def explain_prediction(self, resume_text, top_role_index, resume_terms=None):
         """Generate explanation for why a role was predicted"""
         try:
-            return self.explain_with_keywords(resume_text, top_role_index)
+            return self.explain_with_keywords(resume_text, top_role_index, resume_terms)
                 
         except Exception as e:
             print(f"⚠️  Explanation generation failed: {e}")
-            return self.explain_with_keywords(resume_text, top_role_index)
+            return self.explain_with_keywords(resume_text, top_role_index, resume_terms)
 
-    def explain_with_keywords(self, resume_text, top_role_index):
+    def explain_with_keywords(self, resume_text, top_role_index, resume_terms=None):
         """Fallback keyword-based explanation"""
         try:
             role_name = self.job_role_names[top_role_index]
             job_keywords = self.role_keywords.get(role_name, [])
             
-            resume_words = set(resume_text.lower().split())
+            resume_words = resume_terms if resume_terms is not None else self.extract_resume_terms(resume_text)
             matched_keywords = [kw for kw in job_keywords if kw in resume_words]
             
             explanations = []
@@ -618,16 +815,54 @@ class CompleteJobRoleSystem:
 # Global system instance
 job_system = CompleteJobRoleSystem()
 
-def load_job_matching_system():
+# Rankings and explanations keyed by cleaned resume text and model version
+result_cache = ResultCache()
+
+# Request, stage and input-size metrics served on /metrics
+metrics = ServiceMetrics()
+metrics.registry.add_collector(metrics.cache_collector(lambda: {'result': result_cache}))
+
+def current_job_system():
+    """The system this request started on; a reload swapping job_system meanwhile does not affect it"""
+    return g.get('job_system', job_system)
+
+def cached_ranking(cleaned_resume):
+    """Full role ranking for a cleaned resume, served from the result cache when possible"""
+    system = current_job_system()
+    key = cache_key('rank', system.model_version, cleaned_resume)
+    
+    def compute():
+        with metrics.stage('role_score'):
+            return system.rank_roles(cleaned_resume)
+    return cached_result(key, compute)
+
+def cached_result(key, compute):
+    """Result cache lookup, skipped for profiled requests so the profile shows the real work"""
+    system = current_job_system()
+    # Requests finishing on a replaced system must not flip the cache back to its version
+    if g.get('profiling') or system is not job_system:
+        return compute()
+    result_cache.ensure_version(system.model_version)
+    return result_cache.get_or_compute(key, compute)
+
+def clean_and_measure(resume_text):
+    """Clean a resume, recording the cleaning time and the resume's size"""
+    with metrics.stage('clean'):
+        cleaned_resume = current_job_system().clean_text(resume_text)
+    metrics.observe_resume(len(resume_text.encode('utf-8')), len(cleaned_resume.split()))
+    return cleaned_resume
+
+def load_job_matching_system(model_path=None, rebuild=False, system=None, fallback=True):
     """Load the job matching system with error handling"""
+    system = system or job_system
     print("🚀 Loading Job Role Matching System...")
     print("=" * 50)
     
     # Try to load pre-trained model
-    model_loaded = job_system.load_complete_model()
+    model_loaded = system.load_complete_model(model_path, rebuild=rebuild, fallback=fallback)
     
     if model_loaded:
-        if job_system.validate_loaded_model():
+        if system.validate_loaded_model():
             print("🎉 System loaded successfully!")
             return True
         else:
@@ -637,8 +872,157 @@ def load_job_matching_system():
         print("❌ No pre-trained model found or model loading failed")
         return False
 
+# Held by the one reload running at a time; requests never take it
+reload_lock = threading.Lock()
+reload_status = {"state": "idle", "started_at": None, "finished_at": None, "model_version": None, "error": None}
+
+def build_job_system(model_path=None):
+    """Load, validate and warm up a new system off to the side; None if it cannot serve"""
+    system = CompleteJobRoleSystem()
+    # Only the artifact on disk: a reload never recompiles the built-in catalog or writes the artifact
+    if not load_job_matching_system(model_path, system=system, fallback=False):
+        return None
+    
+    system.predict_top_roles_for_resume(WARMUP_RESUME)
+    system.predict_top_roles_batch([WARMUP_RESUME])
+    system.explain_prediction(system.clean_text(WARMUP_RESUME), 0)
+    return system
+
+def reload_job_system(model_path=None):
+    """Build a new system and publish it with one reference swap (read-copy-update)"""
+    global job_system, system_loaded
+    try:
+        system = build_job_system(model_path)
+        if system is None:
+            reload_status.update(state="failed", error="The new job catalog could not be loaded")
+        else:
+            # Requests already running keep the snapshot they started with; new ones get this system
+            job_system = system
+            system_loaded = True
+            result_cache.ensure_version(system.model_version)
+            reload_status.update(state="succeeded", model_version=system.model_version, error=None)
+            print(f"🔁 Now serving job catalog {system.model_version[:12]}")
+    except Exception as e:
+        reload_status.update(state="failed", error=str(e))
+        print(f"❌ Reload failed, still serving {job_system.model_version}: {e}")
+    finally:
+        reload_status["finished_at"] = time.time()
+        reload_lock.release()
+
+def start_background_reload(model_path=None):
+    """Start a reload thread unless one is already running; returns whether one was started"""
+    if not reload_lock.acquire(blocking=False):
+        return False
+    reload_status.update(state="running", started_at=time.time(), finished_at=None, error=None)
+    threading.Thread(target=reload_job_system, args=(model_path,), daemon=True).start()
+    return True
+
+def watch_model_artifact(model_path, interval):
+    """Reload whenever the artifact on disk holds a catalog other than the one being served"""
+    attempted = None
+    while True:
+        time.sleep(interval)
+        manifest = read_manifest(model_path)
+        content_hash = manifest.get('content_hash') if manifest else None
+        # A catalog that failed to load is only retried once the artifact changes again
+        if content_hash and content_hash != job_system.model_version and content_hash != attempted:
+            if start_background_reload(model_path):
+                attempted = content_hash
+
+def parse_cli_args(argv):
+    """Command line options for running the server directly"""
+    parser = argparse.ArgumentParser(description="Smart Hire job matching server")
+    parser.add_argument('--model-path', default=None, help="Compiled job catalog artifact directory")
+    parser.add_argument('--rebuild', action='store_true',
+                        help="Recompile the artifact if the job structure has changed")
+    return parser.parse_args(argv)
+
 # Load the system when the app starts
-system_loaded = load_job_matching_system()
+cli_args = parse_cli_args(sys.argv[1:] if __name__ == '__main__' else [])
+system_loaded = load_job_matching_system(cli_args.model_path, rebuild=cli_args.rebuild)
+serving_model_path = cli_args.model_path or DEFAULT_MODEL_PATH
+
+if MODEL_WATCH_SECONDS > 0:
+    threading.Thread(target=watch_model_artifact, args=(serving_model_path, MODEL_WATCH_SECONDS),
+                     daemon=True).start()
+
+# Candidate search index over stored resumes, mapped on the first /search/candidates request
+candidate_index = None
+candidate_index_lock = threading.Lock()
+
+def get_candidate_index():
+    """The memory-mapped candidate index, or None if candidate_index.py has not built one yet
+
+    The manifest is checked on every call, so an index rebuilt by candidate_index.py (for example after
+    a catalog reload made the served one stale) is picked up without a restart.
+    """
+    global candidate_index
+    from candidate_index import CandidateIndex, DEFAULT_INDEX_PATH
+    manifest = read_manifest(DEFAULT_INDEX_PATH)
+    index = candidate_index
+    if manifest is None or (index is not None and index.version == manifest.get('content_hash')):
+        return index
+    
+    with candidate_index_lock:
+        if candidate_index is None or candidate_index.version != manifest.get('content_hash'):
+            try:
+                candidate_index = CandidateIndex.load(DEFAULT_INDEX_PATH)
+                print(f"🗂️  Candidate index {candidate_index.version[:12]} loaded: {len(candidate_index)} resumes")
+            except Exception as e:
+                # Keep serving the index already mapped, if any; the next request tries again
+                print(f"⚠️  Could not load candidate index at {DEFAULT_INDEX_PATH}: {e}")
+        return candidate_index
+
+def metrics_route():
+    """Route template used as the metrics label, so raw paths cannot blow up cardinality"""
+    return request.url_rule.rule if request.url_rule else 'unmatched'
+
+@app.before_request
+def pin_job_system():
+    # Every handler and helper of this request reads this one snapshot
+    g.job_system = job_system
+
+@app.before_request
+def start_request_metrics():
+    g.metrics_started = time.perf_counter()
+    g.metrics_route = metrics_route()
+    metrics.in_flight.inc(route=g.metrics_route)
+
+@app.after_request
+def record_request_metrics(response):
+    # Streaming responses are timed until their generator is handed to the server
+    route = g.get('metrics_route', metrics_route())
+    metrics.requests.inc(route=route, method=request.method, status=response.status_code)
+    if 'metrics_started' in g:
+        metrics.request_duration.observe(time.perf_counter() - g.metrics_started,
+                                         route=route, method=request.method)
+    return response
+
+@app.teardown_request
+def finish_request_metrics(error=None):
+    if 'metrics_route' in g:
+        metrics.in_flight.dec(route=g.pop('metrics_route'))
+
+def profiled(view):
+    """Run the view under cProfile when an admin asks for it with X-Profile or ?profile="""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        mode = profiling.requested_mode(request.headers, request.args)
+        if mode is None:
+            return view(*args, **kwargs)
+        if not profiling.is_authorized(request.headers.get(profiling.ADMIN_TOKEN_HEADER)):
+            return jsonify({"error": "Profiling requires a valid admin token"}), 403
+        
+        g.profiling = True
+        with profiling.RequestProfiler(mode) as profiler:
+            response = make_response(view(*args, **kwargs))
+        
+        payload = response.get_json(silent=True)
+        if isinstance(payload, dict):
+            payload['profile'] = profiler.report()
+            response.set_data(json.dumps(payload))
+        return response
+    return wrapper
 
 # Flask Routes
 @app.route('/')
@@ -649,37 +1033,86 @@ def home():
         "model_loaded": system_loaded,
         "endpoints": {
             "/predict": "POST - Predict job roles from resume text",
+            "/predict/batch": "POST - Predict job roles for many resumes (JSON array up to JOB_BATCH_JSON_MAX_BYTES, or NDJSON of any size), streams NDJSON",
             "/domains": "GET - Get all available domains",
             "/health": "GET - Health check",
             "/roles/<domain>": "GET - Get roles by domain",
             "/role/<role_name>": "GET - Get role details",
             "/explain": "POST - Explain prediction",
+            "/search/candidates": "GET/POST - Rank stored resumes for a role or a free-text query",
+            "/cache/stats": "GET - Result cache counters",
+            "/metrics": "GET - Prometheus metrics",
+            "/profiles/<profile_id>": "GET - Download a saved request profile (admin)",
+            "/admin/reload": "POST - Reload the job catalog without a restart, GET - reload status (admin)",
             "/demo": "GET - Demo predictions"
         }
     })
 
 @app.route('/health')
 def health_check():
+    system = current_job_system()
     return jsonify({
         "status": "healthy",
         "model_loaded": system_loaded,
-        "domains_loaded": len(job_system.get_all_domains()) if system_loaded else 0,
-        "roles_loaded": len(job_system.job_role_names) if system_loaded else 0
+        "domains_loaded": len(system.get_all_domains()) if system_loaded else 0,
+        "roles_loaded": len(system.job_role_names) if system_loaded else 0,
+        "model_version": system.model_version,
+        "cache": result_cache.stats()
     })
 
+@app.route('/cache/stats')
+def cache_stats():
+    return jsonify(result_cache.stats())
+
+@app.route('/metrics')
+def prometheus_metrics():
+    return Response(metrics.render(), content_type=METRICS_CONTENT_TYPE)
+
+@app.route('/profiles/<profile_id>')
+def download_profile(profile_id):
+    if not profiling.is_authorized(request.headers.get(profiling.ADMIN_TOKEN_HEADER)):
+        return jsonify({"error": "Profile downloads require a valid admin token"}), 403
+    
+    path = profiling.profile_path(profile_id)
+    if path is None:
+        return jsonify({"error": f"Profile '{profile_id}' not found"}), 404
+    return send_file(path, mimetype='application/octet-stream', as_attachment=True,
+                     download_name=f"{profile_id}.prof")
+
+@app.route('/admin/reload', methods=['GET', 'POST'])
+def reload_catalog():
+    """POST loads the catalog artifact on disk in the background and swaps it in; GET shows the last reload
+
+    Reloading never recompiles: the running process only has the job structure it was started with.
+    After changing the job structure, recompile offline (train.py, or starting the new code with
+    --rebuild) and then POST here.
+    """
+    if not profiling.is_authorized(request.headers.get(profiling.ADMIN_TOKEN_HEADER)):
+        return jsonify({"error": "Reloading requires a valid admin token"}), 403
+    
+    if request.method == 'GET':
+        return jsonify({"reload": reload_status, "model_version": job_system.model_version})
+    
+    if not start_background_reload(serving_model_path):
+        return jsonify({"error": "A reload is already running", "reload": reload_status}), 409
+    return jsonify({"reload": reload_status, "model_version": job_system.model_version}), 202
+
 @app.route('/domains')
 def get_domains():
+    system = current_job_system()
     if not system_loaded:
         return jsonify({"error": "Model not loaded"}), 500
     
-    domains = job_system.get_all_domains()
+    domains = system.get_all_domains()
     return jsonify({
         "domains": domains,
         "count": len(domains)
     })
 
 @app.route('/predict', methods=['POST'])
+@profiled
 def predict_job_roles():
+    system = current_job_system()
     if not system_loaded:
         return jsonify({"error": "Model not loaded. Please train the model first."}), 500
     
@@ -695,8 +1128,11 @@ def predict_job_roles():
         if not resume_text or len(resume_text.strip()) < 10:
             return jsonify({"error": "Resume text too short"}), 400
         
-        # Make prediction
-        top_roles, predicted_domain = job_system.predict_top_roles_for_resume(resume_text, top_k=top_k)
+        # Make prediction; the cached ranking covers every top_k
+        cleaned_resume = clean_and_measure(resume_text)
+        ranking = cached_ranking(cleaned_resume)
+        with metrics.stage('explain'):
+            top_roles, predicted_domain = system.roles_from_ranking(cleaned_resume, ranking, top_k=top_k)
         
         # Prepare response
         response = {
@@ -711,12 +1147,127 @@ def predict_job_roles():
     except Exception as e:
         return jsonify({"error": f"Prediction failed: {str(e)}"}), 500
 
+def read_batch_envelope():
+    """(records, options, error, status) of a JSON array or {"resumes": [...]} body; records is None for NDJSON"""
+    if request.mimetype in ('application/x-ndjson', 'application/jsonl'):
+        return None, {}, None, None
+    
+    # Read at most one byte past the cap, so an oversized body is never held in memory
+    too_large = (f"JSON batch bodies are limited to {BATCH_JSON_MAX_BYTES} bytes; "
+                 "send larger batches as NDJSON (Content-Type: application/x-ndjson), which is streamed")
+    if request.content_length is not None and request.content_length > BATCH_JSON_MAX_BYTES:
+        return None, {}, too_large, 413
+    body = request.stream.read(BATCH_JSON_MAX_BYTES + 1)
+    if len(body) > BATCH_JSON_MAX_BYTES:
+        return None, {}, too_large, 413
+    
+    try:
+        data = json.loads(body)
+    except ValueError:
+        data = None
+    records = data.get('resumes') if isinstance(data, dict) else data
+    if not isinstance(records, list):
+        return None, {}, "Body must be a JSON array of resumes, an object with a 'resumes' array, or NDJSON", 400
+    return records, data if isinstance(data, dict) else {}, None, None
+
+def iter_batch_records(records=None):
+    """Yield (id, resume_text, error) for each record of the body; a bad record yields an error instead of raising"""
+    if records is not None:
+        for record in records:
+            yield parse_batch_record(record)
+        return
+    
+    # NDJSON: read line by line so the body is never held in memory at once
+    for line in request.stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield None, None, f"Invalid JSON: {str(e)}"
+            continue
+        yield parse_batch_record(record)
+
+def parse_batch_record(record):
+    """Accept either a bare resume string or an object with 'resume_text' and optional 'id'"""
+    if isinstance(record, dict):
+        record_id, text = record.get('id'), record.get('resume_text')
+    else:
+        record_id, text = None, record
+    if not isinstance(text, str):
+        return record_id, None, "Record must be a resume string or an object with a 'resume_text' string"
+    return record_id, text, None
+
+def score_batch_chunk(chunk, top_k, start_index):
+    """Score one chunk of resumes and serialize each result as an NDJSON line"""
+    system = current_job_system()
+    valid = [(offset, text) for offset, (_, text, error) in enumerate(chunk)
+             if error is None and len(text.strip()) >= 10]
+    for _, text in valid:
+        metrics.resume_bytes.observe(len(text.encode('utf-8')))
+    with metrics.stage('batch_score'):
+        predictions = system.predict_top_roles_batch([text for _, text in valid], top_k=top_k)
+    results = {offset: prediction for (offset, _), prediction in zip(valid, predictions)}
+    
+    lines = []
+    for offset, (record_id, text, error) in enumerate(chunk):
+        record = {"index": start_index + offset}
+        if record_id is not None:
+            record["id"] = record_id
+        
+        if offset in results:
+            top_roles, predicted_domain = results[offset]
+            record.update({
+                "predicted_domain": predicted_domain,
+                "top_roles": top_roles,
+                "resume_length": len(text)
+            })
+        else:
+            record["error"] = error or "Resume text too short"
+        lines.append(json.dumps(record) + "\n")
+    
+    return "".join(lines)
+
+@app.route('/predict/batch', methods=['POST'])
+def predict_job_roles_batch():
+    if not system_loaded:
+        return jsonify({"error": "Model not loaded. Please train the model first."}), 500
+    
+    # A malformed or oversized envelope is rejected before streaming; malformed records get per-record errors
+    records, options, error, status = read_batch_envelope()
+    if error:
+        return jsonify({"error": error}), status
+    
+    try:
+        top_k = int(options.get('top_k', request.args.get('top_k', 3)))
+    except (TypeError, ValueError):
+        return jsonify({"error": "'top_k' must be an integer"}), 400
+    
+    def generate():
+        chunk, start_index = [], 0
+        try:
+            for record in iter_batch_records(records):
+                chunk.append(record)
+                if len(chunk) >= BATCH_CHUNK_SIZE:
+                    yield score_batch_chunk(chunk, top_k, start_index)
+                    start_index += len(chunk)
+                    chunk = []
+            
+            if chunk:
+                yield score_batch_chunk(chunk, top_k, start_index)
+        except Exception as e:
+            yield json.dumps({"index": start_index + len(chunk), "error": f"Batch prediction failed: {str(e)}"}) + "\n"
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
 @app.route('/roles/<domain>')
 def get_roles_by_domain(domain):
+    system = current_job_system()
     if not system_loaded:
         return jsonify({"error": "Model not loaded"}), 500
     
-    roles = job_system.get_roles_by_domain(domain)
+    roles = system.get_roles_by_domain(domain)
     if not roles:
         return jsonify({"error": f"Domain '{domain}' not found"}), 404
     
@@ -728,10 +1279,11 @@ def get_roles_by_domain(domain):
 
 @app.route('/role/<role_name>')
 def get_role_details(role_name):
+    system = current_job_system()
     if not system_loaded:
         return jsonify({"error": "Model not loaded"}), 500
     
-    role_details = job_system.get_role_details(role_name)
+    role_details = system.get_role_details(role_name)
     if not role_details['keywords']:
         return jsonify({"error": f"Role '{role_name}' not found"}), 404
     
@@ -741,7 +1293,9 @@ def get_role_details(role_name):
     })
 
 @app.route('/explain', methods=['POST'])
+@profiled
 def explain_prediction():
+    system = current_job_system()
     if not system_loaded:
         return jsonify({"error": "Model not loaded"}), 500
     
@@ -759,7 +1313,7 @@ def explain_prediction():
         
         # Find the role index
         role_index = None
-        for idx, name in enumerate(job_system.job_role_names):
+        for idx, name in enumerate(system.job_role_names):
             if name == role_name:
                 role_index = idx
                 break
@@ -767,8 +1321,14 @@ def explain_prediction():
         if role_index is None:
             return jsonify({"error": f"Role '{role_name}' not found"}), 404
         
-        # Generate explanation
-        explanation = job_system.explain_prediction(resume_text, role_index)
+        # Generate explanation from the same cleaned text /predict explains
+        cleaned_resume = clean_and_measure(resume_text)
+        key = cache_key('explain', system.model_version, role_index, cleaned_resume)
+        
+        def compute():
+            with metrics.stage('explain'):
+                return system.explain_prediction(cleaned_resume, role_index)
+        explanation = cached_result(key, compute)
         
         return jsonify({
             "role_name": role_name,
@@ -779,8 +1339,68 @@ def explain_prediction():
     except Exception as e:
         return jsonify({"error": f"Explanation failed: {str(e)}"}), 500
 
+@app.route('/search/candidates', methods=['GET', 'POST'])
+@profiled
+def search_candidates():
+    """Top stored resumes for a catalog role (role=...) or free text (query=...)"""
+    system = current_job_system()
+    if not system_loaded:
+        return jsonify({"error": "Model not loaded"}), 500
+    
+    try:
+        params = request.get_json(silent=True) or request.args
+        role_name = params.get('role')
+        query_text = params.get('query')
+        try:
+            top_k = min(max(int(params.get('top_k', 20)), 1), MAX_CANDIDATE_RESULTS)
+        except (TypeError, ValueError):
+            return jsonify({"error": "'top_k' must be an integer"}), 400
+        
+        if not role_name and not query_text:
+            return jsonify({"error": "Provide a 'role' or a 'query'"}), 400
+        if role_name and role_name not in system.role_keywords:
+            return jsonify({"error": f"Role '{role_name}' not found"}), 404
+        
+        index = get_candidate_index()
+        if index is None:
+            return jsonify({"error": "Candidate index not built. Run candidate_index.py first."}), 503
+        if not index.keywords_match(system.keyword_matcher):
+            return jsonify({"error": "Candidate index was built with another job catalog's keywords; "
+                                     "rebuild it with candidate_index.py"}), 409
+        
+        started = time.perf_counter()
+        with metrics.stage('candidate_search'):
+            if role_name:
+                query = index.role_query(system.role_keywords[role_name])
+            else:
+                query = index.text_query(system.clean_text(query_text), system.keyword_matcher)
+            hits, stats = index.search(query, top_k)
+        
+        candidates = [{
+            "rank": rank,
+            "resume_id": str(index.resume_ids[row]),
+            "category": str(index.categories[row]),
+            "score": round(score, 4),
+            "matched_terms": index.matched_terms(row, query)
+        } for rank, (row, score) in enumerate(hits, 1)]
+        
+        return jsonify({
+            "role": role_name,
+            "query": None if role_name else query_text,
+            "query_terms": list(query),
+            "candidates": candidates,
+            "count": len(candidates),
+            "indexed_resumes": len(index),
+            "search": stats,
+            "search_time_ms": round(1000 * (time.perf_counter() - started), 2)
+        })
+        
+    except Exception as e:
+        return jsonify({"error": f"Candidate search failed: {str(e)}"}), 500
+
 @app.route('/demo')
 def demo_predictions():
+    system = current_job_system()
     if not system_loaded:
         return jsonify({"error": "Model not loaded"}), 500
     
@@ -794,7 +1414,7 @@ def demo_predictions():
     
     results = []
     for i, resume_text in enumerate(demo_resumes):
-        top_roles, predicted_domain = job_system.predict_top_roles_for_resume(resume_text)
+        top_roles, predicted_domain = system.predict_top_roles_for_resume(resume_text)
         results.append({
             "demo_id": i + 1,
             "resume_sample": resume_text[:50] + "...",
@@ -806,8 +1426,8 @@ def demo_predictions():
     return jsonify({
         "demo_predictions": results,
         "system_info": {
-            "domains": len(job_system.get_all_domains()),
-            "roles": len(job_system.job_role_names)
+            "domains": len(system.get_all_domains()),
+            "roles": len(system.job_role_names)
         }
     })
 
@@ -823,6 +1443,8 @@ if __name__ == '__main__':
     print("   - GET  /health - System health check")
     print("   - GET  /domains - List all domains")
     print("   - POST /predict - Analyze resume text")
+    print("   - POST /predict/batch - Analyze many resumes (streams NDJSON)")
+    print("   - GET  /metrics - Prometheus metrics")
     print("   - GET  /demo - Demo predictions")
     print("\n⚡ Ready to process requests!")
     
@@ -0,0 +1,219 @@
+"""Minimal in-process metrics registry rendered in the Prometheus text format"""
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+WORDS_BUCKETS = (10, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 25000)
+
+
+def format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def format_labels(labelnames, labelvalues, extra=None):
+    pairs = list(zip(labelnames, labelvalues)) + list(extra or [])
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+
+class Metric:
+    """Base for a named metric family with a fixed set of label names"""
+    type_name = 'untyped'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self):
+        """(suffix, extra labels, label values, value) tuples for rendering"""
+        with self._lock:
+            return [('', (), key, value) for key, value in sorted(self._values.items())]
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        for suffix, extra, key, value in self.samples():
+            lines.append(f"{self.name}{suffix}{format_labels(self.labelnames, key, extra)} {format_value(value)}")
+        return lines
+
+
+class Counter(Metric):
+    type_name = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    type_name = 'gauge'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    @contextmanager
+    def track_inprogress(self, **labels):
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+
+class Histogram(Metric):
+    type_name = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = {'counts': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+            # First bucket whose upper bound is >= value
+            state['counts'][bisect_left(self.buckets, value)] += 1
+            state['sum'] += value
+            state['count'] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def samples(self):
+        with self._lock:
+            items = [(key, dict(state, counts=list(state['counts']))) for key, state in sorted(self._values.items())]
+
+        samples = []
+        for key, state in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, state['counts']):
+                cumulative += count
+                samples.append(('_bucket', [('le', format_value(bound))], key, cumulative))
+            samples.append(('_sum', (), key, state['sum']))
+            samples.append(('_count', (), key, state['count']))
+        return samples
+
+
+class MetricsRegistry:
+    """Collection of metric families plus callbacks that report values computed at scrape time"""
+
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def add_collector(self, collect):
+        """collect() returns metrics (e.g. freshly set gauges) to render alongside the registered ones"""
+        self._collectors.append(collect)
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collect in self._collectors:
+            for metric in collect():
+                lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+class ServiceMetrics:
+    """The metric families both services expose on /metrics"""
+
+    def __init__(self):
+        self.registry = MetricsRegistry()
+        self.requests = self.registry.counter(
+            'smarthire_http_requests_total', 'HTTP requests by route, method and status code',
+            ('route', 'method', 'status'))
+        self.request_duration = self.registry.histogram(
+            'smarthire_http_request_duration_seconds', 'Time to produce the HTTP response',
+            ('route', 'method'))
+        self.in_flight = self.registry.gauge(
+            'smarthire_http_requests_in_flight', 'Requests currently being handled', ('route',))
+        self.stage_duration = self.registry.histogram(
+            'smarthire_stage_duration_seconds', 'Time spent in each processing stage', ('stage',))
+        self.resume_bytes = self.registry.histogram(
+            'smarthire_resume_bytes', 'Size of each resume received (upload or text, in bytes)',
+            buckets=BYTES_BUCKETS)
+        self.resume_words = self.registry.histogram(
+            'smarthire_resume_words', 'Words per resume after cleaning', buckets=WORDS_BUCKETS)
+
+    def stage(self, name):
+        """Context manager timing one processing stage"""
+        return self.stage_duration.time(stage=name)
+
+    def observe_stages(self, timings):
+        """Record stage durations measured elsewhere, e.g. in a worker process"""
+        for name, seconds in timings.items():
+            self.stage_duration.observe(seconds, stage=name)
+
+    def observe_resume(self, size_bytes, words):
+        self.resume_bytes.observe(size_bytes)
+        self.resume_words.observe(words)
+
+    def cache_collector(self, caches):
+        """Collector exposing ResultCache counters as gauges, caches being {name: ResultCache}"""
+        def collect():
+            entries = Gauge('smarthire_cache_entries', 'Entries held by the result cache', ('cache',))
+            counters = {
+                field: Counter(f'smarthire_cache_{field}_total', f'Result cache {field}', ('cache',))
+                for field in ('hits', 'misses', 'evictions', 'expirations', 'invalidations')
+            }
+            for cache_name, cache in caches().items():
+                stats = cache.stats()
+                entries.set(stats['entries'], cache=cache_name)
+                for field, counter in counters.items():
+                    # Fresh counter per scrape, so inc() reports the cache's running total
+                    counter.inc(stats[field], cache=cache_name)
+            return [entries, *counters.values()]
+        return collect
+
+    def render(self):
+        return self.registry.render()
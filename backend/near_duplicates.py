@@ -0,0 +1,183 @@
+"""MinHash near-duplicate detection for resumes.
+
+A resume becomes the set of its word 3-shingles (words without digits, so
+changed phone numbers and dates barely move it); reordering sections only
+changes the few shingles that straddle a section boundary. 128 MinHash
+values estimate the Jaccard similarity of two such sets. LSH banding
+(16 bands of 8 values) turns "share a band" into the candidate test: pairs
+at Jaccard 0.8 become candidates ~95% of the time, pairs at 0.5 well under
+5%. Candidates are confirmed on the full signature against the threshold.
+
+find_near_duplicates collapses a corpus in one pass per band;
+NearDuplicateIndex remembers already analyzed resumes so re-submissions
+can reuse their results.
+"""
+import os
+import re
+import threading
+import zlib
+from collections import OrderedDict
+
+import numpy as np
+
+# Estimated Jaccard similarity of shingle sets at or above which two resumes count as the same
+NEAR_DUPLICATE_THRESHOLD = float(os.environ.get('NEAR_DUPLICATE_THRESHOLD', 0.8))
+
+MINHASH_PERMUTATIONS = 128
+MINHASH_BANDS = 16
+SHINGLE_SIZE = 3
+
+_WORD_PATTERN = re.compile(r'[a-z]+')
+
+
+class MinHasher:
+    """MinHash signatures of word shingle sets"""
+
+    def __init__(self, num_perm=MINHASH_PERMUTATIONS, shingle_size=SHINGLE_SIZE, seed=1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        # Multiply-shift hashing: the high 32 bits of a * x + b (mod 2**64), with a odd
+        self._a = (rng.integers(0, 2 ** 63, num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1))[:, None]
+        self._b = rng.integers(0, 2 ** 63, num_perm, dtype=np.uint64)[:, None]
+
+    def shingles(self, text):
+        """Distinct 32-bit hashes of the text's word n-grams"""
+        words = _WORD_PATTERN.findall(str(text).lower()) if text else []
+        if not words:
+            return np.empty(0, dtype=np.uint64)
+        hashes = np.fromiter((zlib.crc32(word.encode()) for word in words), dtype=np.uint64, count=len(words))
+        size = min(self.shingle_size, len(hashes))
+        # Order-sensitive mix of consecutive word hashes; uint64 arithmetic wraps
+        combined = hashes[:len(hashes) - size + 1].copy()
+        for offset in range(1, size):
+            combined = combined * np.uint64(1000003) + hashes[offset:len(hashes) - size + 1 + offset]
+        return np.unique(combined & np.uint64(0xFFFFFFFF))
+
+    def signature(self, text):
+        """num_perm minimum hash values; equal fractions of two signatures estimate Jaccard similarity"""
+        shingles = self.shingles(text)
+        if len(shingles) == 0:
+            return np.full(self.num_perm, np.iinfo(np.uint32).max, dtype=np.uint32)
+        return ((self._a * shingles + self._b) >> np.uint64(32)).min(axis=1).astype(np.uint32)
+
+    def signatures(self, texts):
+        return np.array([self.signature(text) for text in texts], dtype=np.uint32).reshape(-1, self.num_perm)
+
+
+def band_keys(signature, bands=MINHASH_BANDS):
+    """One hashable key per LSH band of a signature"""
+    return [(band, chunk.tobytes()) for band, chunk in enumerate(np.split(signature, bands))]
+
+
+def find_near_duplicates(signatures, threshold=None, bands=MINHASH_BANDS):
+    """For each row, the earliest row of its near-duplicate cluster, or -1 if the row is that earliest one"""
+    threshold = NEAR_DUPLICATE_THRESHOLD if threshold is None else threshold
+    n_rows, num_perm = signatures.shape
+    rows_per_band = num_perm // bands
+    parent = np.arange(n_rows)
+
+    def find(row):
+        while parent[row] != row:
+            parent[row] = parent[parent[row]]
+            row = parent[row]
+        return row
+
+    for band in range(bands):
+        chunk = np.ascontiguousarray(signatures[:, band * rows_per_band:(band + 1) * rows_per_band])
+        _, bucket = np.unique(chunk.view(np.dtype((np.void, chunk.dtype.itemsize * rows_per_band))).ravel(),
+                              return_inverse=True)
+        order = np.argsort(bucket, kind='stable')
+        starts = np.flatnonzero(np.r_[True, bucket[order][1:] != bucket[order][:-1]])
+        sizes = np.diff(np.r_[starts, n_rows])
+        # Compare every bucket member with the bucket's earliest row instead of all pairs, keeping this linear
+        first = np.repeat(order[starts], sizes)
+        candidates = order != first
+        agreement = (signatures[order[candidates]] == signatures[first[candidates]]).mean(axis=1)
+        for row, earliest in zip(order[candidates][agreement >= threshold], first[candidates][agreement >= threshold]):
+            row_root, earliest_root = find(row), find(earliest)
+            if row_root != earliest_root:
+                parent[max(row_root, earliest_root)] = min(row_root, earliest_root)
+
+    roots = np.array([find(row) for row in range(n_rows)])
+    return np.where(roots == np.arange(n_rows), -1, roots)
+
+
+class NearDuplicateIndex:
+    """Bounded, thread-safe MinHash LSH index of analyzed resumes and their results"""
+
+    def __init__(self, threshold=None, max_entries=None, hasher=None):
+        self.threshold = NEAR_DUPLICATE_THRESHOLD if threshold is None else threshold
+        self.max_entries = int(max_entries or os.environ.get('NEAR_DUPLICATE_CACHE_SIZE', 2048))
+        self.hasher = hasher or MinHasher()
+        self.version = None
+        self._entries = OrderedDict()
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def ensure_version(self, version):
+        """Forget every resume when the model version changes; its results would be stale"""
+        if version != self.version:
+            with self._lock:
+                if version != self.version:
+                    self._entries.clear()
+                    self._buckets.clear()
+                    self.version = version
+
+    def signature(self, cleaned_text):
+        return self.hasher.signature(cleaned_text)
+
+    def find(self, signature):
+        """(value, estimated Jaccard) of the most similar stored resume at or above the threshold, else None"""
+        with self._lock:
+            candidates = set()
+            for key in band_keys(signature):
+                candidates.update(self._buckets.get(key, ()))
+
+            best, best_similarity = None, self.threshold
+            for entry_key in candidates:
+                similarity = float(np.mean(self._entries[entry_key][0] == signature))
+                if similarity >= best_similarity:
+                    best, best_similarity = entry_key, similarity
+
+            if best is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(best)
+            return self._entries[best][1], best_similarity
+
+    def add(self, entry_key, signature, value):
+        """Remember an analyzed resume, evicting the least recently matched ones beyond max_entries"""
+        with self._lock:
+            if entry_key in self._entries:
+                self._entries.move_to_end(entry_key)
+                return
+            self._entries[entry_key] = (signature, value)
+            for key in band_keys(signature):
+                self._buckets.setdefault(key, set()).add(entry_key)
+            while len(self._entries) > self.max_entries:
+                evicted, (evicted_signature, _) = self._entries.popitem(last=False)
+                for key in band_keys(evicted_signature):
+                    bucket = self._buckets[key]
+                    bucket.discard(evicted)
+                    if not bucket:
+                        del self._buckets[key]
+                self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'threshold': self.threshold,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'version': self.version
+            }
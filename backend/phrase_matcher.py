@@ -0,0 +1,77 @@
+import re
+from collections import deque
+
+# Words are runs of letters/digits; a trailing '+' or '#' keeps c++ and c# intact
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+[+#]*')
+
+
+def tokenize(text):
+    """Split text into lowercase word tokens used for phrase matching"""
+    return TOKEN_PATTERN.findall(str(text).lower()) if text else []
+
+
+class PhraseMatcher:
+    """Aho-Corasick automaton over word tokens for single- and multi-word keywords"""
+
+    def __init__(self, phrases):
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [()]
+        self.phrases = set()
+
+        for phrase in phrases:
+            self._add(phrase)
+        self._compile()
+
+    def _add(self, phrase):
+        tokens = tokenize(phrase)
+        if not tokens or phrase in self.phrases:
+            return
+
+        state = 0
+        for token in tokens:
+            next_state = self._goto[state].get(token)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][token] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+            state = next_state
+
+        self._output[state] = self._output[state] + (phrase,)
+        self.phrases.add(phrase)
+
+    def _compile(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, next_state in self._goto[state].items():
+                queue.append(next_state)
+
+                fallback = self._fail[state]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(token, 0)
+
+                # Inherit the phrases that end on the suffix we fall back to
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def find_tokens(self, tokens):
+        """Return every phrase occurring in an already tokenized text"""
+        goto, fail, output = self._goto, self._fail, self._output
+        found = set()
+        state = 0
+
+        for token in tokens:
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            if output[state]:
+                found.update(output[state])
+
+        return found
+
+    def find(self, text):
+        """Return every phrase occurring in text, in a single pass over its tokens"""
+        return self.find_tokens(tokenize(text))
@@ -0,0 +1,104 @@
+"""Opt-in cProfile runs of single requests, guarded by an admin token.
+
+A request asks for profiling with the X-Profile header or the ?profile= query
+flag ('top' returns the top functions by cumulative time in the response,
+'save' stores the profile under an ID for download from /profiles/<id>). It
+must also carry X-Admin-Token matching SMARTHIRE_ADMIN_TOKEN; with no token
+configured profiling is disabled. Requests without the flag never create a
+profiler.
+"""
+import cProfile
+import hmac
+import io
+import os
+import pstats
+import re
+import tempfile
+import uuid
+
+ADMIN_TOKEN = os.environ.get('SMARTHIRE_ADMIN_TOKEN')
+PROFILE_DIR = os.environ.get('SMARTHIRE_PROFILE_DIR', os.path.join(tempfile.gettempdir(), 'smarthire_profiles'))
+PROFILE_TOP_N = int(os.environ.get('SMARTHIRE_PROFILE_TOP_N', 25))
+
+PROFILE_HEADER = 'X-Profile'
+ADMIN_TOKEN_HEADER = 'X-Admin-Token'
+PROFILE_MODES = ('top', 'save')
+PROFILE_ID_PATTERN = re.compile(r'^[0-9a-f]{32}$')
+
+
+def requested_mode(headers, query_params):
+    """'top', 'save' or None, from the X-Profile header or the profile query flag"""
+    value = headers.get(PROFILE_HEADER) or query_params.get('profile')
+    if not value:
+        return None
+    value = value.strip().lower()
+    if value in PROFILE_MODES:
+        return value
+    return 'top' if value in ('1', 'true', 'yes') else None
+
+
+def is_authorized(token):
+    """Constant-time check of the admin token; always False when none is configured"""
+    return bool(ADMIN_TOKEN) and token is not None and hmac.compare_digest(token, ADMIN_TOKEN)
+
+
+def profile_path(profile_id):
+    """Path of a saved profile, or None for IDs that are not ours"""
+    if not PROFILE_ID_PATTERN.match(profile_id or ''):
+        return None
+    path = os.path.join(PROFILE_DIR, f"{profile_id}.prof")
+    return path if os.path.exists(path) else None
+
+
+class RequestProfiler:
+    """Deterministic profile of one block of work"""
+
+    def __init__(self, mode='top', top_n=None):
+        self.mode = mode
+        self.top_n = top_n or PROFILE_TOP_N
+        self.profiler = cProfile.Profile()
+
+    def __enter__(self):
+        self.profiler.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profiler.disable()
+        return False
+
+    def top_functions(self):
+        """Top functions by cumulative time"""
+        stats = pstats.Stats(self.profiler, stream=io.StringIO())
+        stats.sort_stats(pstats.SortKey.CUMULATIVE)
+        rows = []
+        for func in stats.fcn_list[:self.top_n]:
+            primitive_calls, total_calls, own_time, cumulative_time, _ = stats.stats[func]
+            filename, line, name = func
+            rows.append({
+                'function': name,
+                'file': filename,
+                'line': line,
+                'calls': total_calls,
+                'primitive_calls': primitive_calls,
+                'tottime': round(own_time, 6),
+                'cumtime': round(cumulative_time, 6)
+            })
+        return rows
+
+    def save(self):
+        """Dump the profile in pstats format and return its ID"""
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        profile_id = uuid.uuid4().hex
+        self.profiler.dump_stats(os.path.join(PROFILE_DIR, f"{profile_id}.prof"))
+        return profile_id
+
+    def report(self):
+        """What is returned next to the normal response"""
+        stats = pstats.Stats(self.profiler, stream=io.StringIO())
+        report = {'mode': self.mode, 'total_seconds': round(stats.total_tt, 6)}
+        if self.mode == 'save':
+            profile_id = self.save()
+            report.update({'profile_id': profile_id, 'download': f"/profiles/{profile_id}"})
+        else:
+            report['top_functions'] = self.top_functions()
+        return report
@@ -0,0 +1,103 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+def cache_key(*parts):
+    """SHA-256 over the given parts, e.g. (namespace, model_version, cleaned_text)"""
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode('utf-8')
+        elif not isinstance(part, bytes):
+            part = str(part).encode('utf-8')
+        digest.update(len(part).to_bytes(8, 'little'))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """Bounded, thread-safe LRU cache with per-entry TTL and hit/miss/eviction counters"""
+
+    def __init__(self, max_entries=None, ttl_seconds=None):
+        self.max_entries = int(max_entries or os.environ.get('RESULT_CACHE_SIZE', 2048))
+        self.ttl_seconds = float(ttl_seconds or os.environ.get('RESULT_CACHE_TTL', 3600))
+        self.version = None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def ensure_version(self, version):
+        """Drop every entry when the model/catalog version changes"""
+        if version != self.version:
+            with self._lock:
+                if version != self.version:
+                    if self._entries:
+                        self.invalidations += 1
+                    self._entries.clear()
+                    self.version = version
+
+    def get(self, key):
+        """Return the cached value or None, refreshing its LRU position"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        """Store a value, evicting the least recently used entries beyond max_entries"""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, key, compute):
+        """Cached value for key, computing and storing it on a miss"""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            if value is not None:
+                self.set(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.invalidations += 1
+
+    def stats(self):
+        """Counters for health and monitoring endpoints"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations,
+                'version': self.version
+            }
@@ -1,10 +1,53 @@
-import pdfplumber
-import docx
 import re
 import io
+import os
+import time
+from phrase_matcher import PhraseMatcher
+
+# Extraction budgets per document; scoring only needs the first few pages of a resume
+DEFAULT_MAX_PAGES = int(os.environ.get('RESUME_MAX_PAGES', 20))
+DEFAULT_MAX_CHARS = int(os.environ.get('RESUME_MAX_CHARS', 50000))
+DEFAULT_MAX_SECONDS = float(os.environ.get('RESUME_MAX_SECONDS', 10))
+
+# 'pypdf' reads the raw text stream without layout analysis; 'pdfplumber' is the layout-aware fallback
+DEFAULT_PDF_BACKEND = os.environ.get('RESUME_PDF_BACKEND', 'pypdf')
+FALLBACK_PDF_BACKEND = 'pdfplumber'
+
+def pdfplumber_pages(file_content, stats):
+    """Yield page texts using pdfplumber's layout analysis"""
+    # Parser backends are imported on first upload rather than at service start
+    import pdfplumber
+    
+    with pdfplumber.open(io.BytesIO(file_content)) as pdf:
+        stats['total_pages'] = len(pdf.pages)
+        for page in pdf.pages:
+            page_text = page.extract_text()
+            # Drop the page's parsed layout objects before moving on
+            page.close()
+            yield page_text
+
+def pypdf_pages(file_content, stats):
+    """Yield page texts straight from the content streams, skipping layout analysis"""
+    from pypdf import PdfReader
+    
+    reader = PdfReader(io.BytesIO(file_content))
+    stats['total_pages'] = len(reader.pages)
+    for page in reader.pages:
+        yield page.extract_text()
+
+PDF_BACKENDS = {
+    'pdfplumber': pdfplumber_pages,
+    'pypdf': pypdf_pages
+}
 
 class ResumeParser:
-    def __init__(self):
+    def __init__(self, max_pages=None, max_chars=None, max_seconds=None, pdf_backend=None):
+        self.pdf_backend = pdf_backend or DEFAULT_PDF_BACKEND
+        if self.pdf_backend not in PDF_BACKENDS:
+            raise ValueError(f"Unknown PDF backend '{self.pdf_backend}', choose from {sorted(PDF_BACKENDS)}")
+        self.max_pages = max_pages or DEFAULT_MAX_PAGES
+        self.max_chars = max_chars or DEFAULT_MAX_CHARS
+        self.max_seconds = max_seconds or DEFAULT_MAX_SECONDS
         self.skill_keywords = {
             'programming': ['python', 'java', 'javascript', 'c++', 'c#', 'sql', 'html', 'css', 'react', 'angular', 'vue', 'node', 'typescript'],
             'data_science': ['machine learning', 'data analysis', 'statistics', 'tensorflow', 'pytorch', 'pandas', 'numpy', 'sql', 'tableau', 'power bi'],
@@ -17,29 +60,82 @@ class ResumeParser:
             'marketing': ['digital marketing', 'seo', 'sem', 'social media', 'content marketing', 'google analytics'],
             'design': ['ui/ux', 'figma', 'adobe creative suite', 'graphic design', 'web design']
         }
+        self.skill_matcher = PhraseMatcher(
+            skill for skills in self.skill_keywords.values() for skill in skills
+        )
+    
+    def iter_pdf_pages(self, file_content, stats=None, backend=None):
+        """Yield the text of each PDF page, stopping once the page, character or time budget is spent"""
+        backend = backend or self.pdf_backend
+        stats = stats if stats is not None else {}
+        stats.update({'backend': backend, 'pages_read': 0, 'chars_read': 0, 'truncated': None})
+        started = time.monotonic()
+        
+        pages = PDF_BACKENDS[backend](file_content, stats)
+        try:
+            for page_text in pages:
+                stats['pages_read'] += 1
+                
+                if page_text:
+                    remaining = self.max_chars - stats['chars_read']
+                    if len(page_text) >= remaining:
+                        stats['chars_read'] += remaining
+                        stats['truncated'] = 'max_chars'
+                        yield page_text[:remaining]
+                        break
+                    
+                    stats['chars_read'] += len(page_text)
+                    yield page_text
+                
+                # Budgets are checked between pages, before the next one is extracted
+                if stats['pages_read'] >= stats['total_pages']:
+                    break
+                if stats['pages_read'] >= self.max_pages:
+                    stats['truncated'] = 'max_pages'
+                    break
+                if time.monotonic() - started > self.max_seconds:
+                    stats['truncated'] = 'max_seconds'
+                    break
+        finally:
+            pages.close()
     
-    def extract_text_from_pdf(self, file_content):
+    def extract_text_from_pdf(self, file_content, stats=None):
         """Extract text from PDF file"""
+        stats = stats if stats is not None else {}
         try:
+            text = "\n".join(self.iter_pdf_pages(file_content, stats)).strip()
+        except Exception as e:
+            if self.pdf_backend == FALLBACK_PDF_BACKEND:
+                raise Exception(f"PDF parsing error: {str(e)}")
             text = ""
-            with pdfplumber.open(io.BytesIO(file_content)) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
-            return text.strip()
+        
+        if text or self.pdf_backend == FALLBACK_PDF_BACKEND:
+            return text
+        
+        # The fast backend found nothing (or failed); retry with full layout analysis
+        try:
+            text = "\n".join(self.iter_pdf_pages(file_content, stats, FALLBACK_PDF_BACKEND)).strip()
+            stats['fallback'] = True
+            return text
         except Exception as e:
             raise Exception(f"PDF parsing error: {str(e)}")
     
-    def extract_text_from_docx(self, file_content):
+    def extract_text_from_docx(self, file_content, stats=None):
         """Extract text from DOCX file"""
         try:
+            import docx
+            
             doc = docx.Document(io.BytesIO(file_content))
-            text = ""
+            parts, chars_read = [], 0
             for paragraph in doc.paragraphs:
                 if paragraph.text:
-                    text += paragraph.text + "\n"
-            return text.strip()
+                    parts.append(paragraph.text[:self.max_chars - chars_read])
+                    chars_read += len(parts[-1])
+                    if chars_read >= self.max_chars:
+                        if stats is not None:
+                            stats['truncated'] = 'max_chars'
+                        break
+            return "\n".join(parts).strip()
         except Exception as e:
             raise Exception(f"DOCX parsing error: {str(e)}")
     
@@ -47,14 +143,15 @@ class ResumeParser:
         """Parse resume file and extract text"""
         try:
             text = ""
+            extraction = {'truncated': None}
             
             if filename.lower().endswith('.pdf'):
-                text = self.extract_text_from_pdf(file_content)
+                text = self.extract_text_from_pdf(file_content, extraction)
             elif filename.lower().endswith(('.docx', '.doc')):
-                text = self.extract_text_from_docx(file_content)
+                text = self.extract_text_from_docx(file_content, extraction)
             else:
                 # Assume it's text
-                text = file_content.decode('utf-8', errors='ignore')
+                text = file_content[:self.max_chars * 4].decode('utf-8', errors='ignore')[:self.max_chars]
             
             # Clean the text
             text = self.clean_text(text)
@@ -66,7 +163,8 @@ class ResumeParser:
                 'success': True,
                 'text': text,
                 'skills': skills,
-                'word_count': len(text.split())
+                'word_count': len(text.split()),
+                'extraction': extraction
             }
             
         except Exception as e:
@@ -89,12 +187,12 @@ class ResumeParser:
     def extract_skills(self, text):
         """Extract skills from resume text"""
         found_skills = {}
-        text_lower = text.lower()
+        skill_hits = self.skill_matcher.find(text)
         
         for category, skills in self.skill_keywords.items():
             category_skills = []
             for skill in skills:
-                if skill in text_lower:
+                if skill in skill_hits:
                     category_skills.append(skill.title())
             if category_skills:
                 found_skills[category] = category_skills
@@ -0,0 +1,70 @@
+import numpy as np
+from scipy import sparse
+
+
+class RoleScorer:
+    """Vectorized Jaccard + coverage scoring of resumes against the role catalog"""
+
+    def __init__(self, job_role_names, role_keywords, role_domains):
+        self.job_role_names = list(job_role_names)
+        self.role_domains = list(role_domains)
+        self.keyword_ids = {}
+
+        rows, cols = [], []
+        for role_idx, role_name in enumerate(self.job_role_names):
+            for keyword in set(role_keywords.get(role_name, [])):
+                keyword_id = self.keyword_ids.setdefault(keyword, len(self.keyword_ids))
+                rows.append(role_idx)
+                cols.append(keyword_id)
+
+        # Binary role x keyword matrix; its transpose is the keyword -> role postings
+        self.role_matrix = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.float64), (rows, cols)),
+            shape=(len(self.job_role_names), len(self.keyword_ids))
+        )
+        self.role_sizes = np.asarray(self.role_matrix.sum(axis=1), dtype=np.float64).ravel()
+
+    def vectorize(self, token_sets):
+        """Turn resume token sets into a binary resume x keyword matrix plus set sizes"""
+        indptr, indices = [0], []
+        for tokens in token_sets:
+            indices.extend(self.keyword_ids[token] for token in tokens if token in self.keyword_ids)
+            indptr.append(len(indices))
+
+        resume_matrix = sparse.csr_matrix(
+            (np.ones(len(indices), dtype=np.float64), indices, indptr),
+            shape=(len(token_sets), len(self.keyword_ids))
+        )
+        resume_sizes = np.fromiter((len(tokens) for tokens in token_sets), dtype=np.float64, count=len(token_sets))
+        return resume_matrix, resume_sizes
+
+    def score(self, token_sets):
+        """Score every resume against every role with one sparse mat-mat product"""
+        resume_matrix, resume_sizes = self.vectorize(token_sets)
+        intersection = (resume_matrix @ self.role_matrix.T).toarray()
+        union = resume_sizes[:, None] + self.role_sizes[None, :] - intersection
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            jaccard_similarity = np.where(union > 0, intersection / union, 0.0)
+            keyword_coverage = np.where(self.role_sizes > 0, intersection / self.role_sizes, 0.0)
+
+        combined_score = (jaccard_similarity * 0.4) + (keyword_coverage * 0.6)
+        return np.minimum(combined_score, 1.0)
+
+    def top_k(self, scores, k):
+        """Indices of the top k roles per row, ordered like a stable sort on the rounded score"""
+        n_roles = scores.shape[1]
+        k = max(0, min(int(k), n_roles))
+        if k == 0:
+            return np.empty((scores.shape[0], 0), dtype=np.int64)
+
+        # Integer keys: rounded score first, lower role index wins ties
+        keys = np.rint(scores * 10000).astype(np.int64) * n_roles + (n_roles - 1 - np.arange(n_roles))
+        if k < n_roles:
+            candidates = np.argpartition(-keys, k - 1, axis=1)[:, :k]
+        else:
+            candidates = np.broadcast_to(np.arange(n_roles), keys.shape)
+
+        candidate_keys = np.take_along_axis(keys, candidates, axis=1)
+        order = np.argsort(-candidate_keys, axis=1)
+        return np.take_along_axis(candidates, order, axis=1)
@@ -0,0 +1,349 @@
+"""Approximate nearest-neighbour index over resume TF-IDF vectors for "more like this resume" queries.
+
+Random-projection LSH: each of n_tables tables hashes a vector to the signs of
+its projections onto n_bits random +/-1 hyperplanes, so resumes at a small
+cosine angle tend to share a bucket. A query collects the resumes in its own
+bucket of every table plus, per table, the `probes` buckets reached by
+flipping its one or two least certain bits (multi-probe), then ranks those
+candidates by exact cosine similarity. More probes means more candidates:
+higher recall, higher latency. Buckets are sorted code arrays searched with
+binary search; new resumes go to a small pending set that is merged in on save.
+
+A pair at cosine c agrees on a bit with probability p = 1 - acos(c) / pi, so it
+shares a bucket in at least one table with probability 1 - (1 - p**bits)**tables.
+The 32 x 12 default targets large collections of close neighbours (c >= 0.8:
+~0.88 without probes, while a random pair at c ~ 0.05 collides ~1% of the time).
+It does not suit the bundled corpus, whose 10 nearest neighbours sit at cosine
+~0.3-0.35. There, recall@10 over 200 queries
+(`--evaluate 200 --tables T --bits B`) is:
+
+    tables x bits   probes=0        probes=4        probes=16
+    32 x 12         0.07 (49)       0.29 (224)      0.62 (641)
+    32 x 8          0.40 (461)      0.90 (1548)     1.00 (2366)
+    32 x 6          0.78 (1336)     1.00 (2410)     1.00 (2472)
+
+(mean candidates per query, out of 2473 resumes). Any setting that reaches 0.9
+recall scans most of the corpus, so below SIMILARITY_EXACT_BELOW resumes
+queries use the exact scan (~2.4 ms there) instead. --evaluate also prints the
+corpus's neighbour cosine, which shows which regime an index is in.
+
+Usage (from the backend directory, after training the model):
+    python similarity_index.py --output models/similarity_index --evaluate 200
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+from artifacts import load_artifact, save_artifact
+
+SIMILARITY_INDEX_KIND = 'similarity_index'
+DEFAULT_INDEX_PATH = os.environ.get(
+    'SIMILARITY_INDEX_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models', 'similarity_index')
+)
+
+# Hash tables x bits per table; more bits give smaller buckets, more tables give more chances to collide.
+# Tuned for neighbours at cosine >= 0.8; see the module docstring for the bundled corpus's numbers
+SIMILARITY_TABLES = int(os.environ.get('SIMILARITY_TABLES', 32))
+SIMILARITY_BITS = int(os.environ.get('SIMILARITY_BITS', 12))
+
+# Default extra buckets probed per table: the recall/latency knob of a query
+SIMILARITY_PROBES = int(os.environ.get('SIMILARITY_PROBES', 4))
+
+# Below this many resumes an exact scan is about as fast as probing, so queries skip the hash tables
+SIMILARITY_EXACT_BELOW = int(os.environ.get('SIMILARITY_EXACT_BELOW', 10000))
+
+# Rows vectorized and hashed together when building from a corpus
+BUILD_CHUNK_SIZE = 10000
+
+
+class SimilarityIndex:
+    """Multi-table random-projection LSH over l2-normalized sparse vectors, with exact cosine re-ranking"""
+
+    def __init__(self, projection, n_tables, indptr, indices, data, codes, resume_ids, metadata=None):
+        self.projection = projection
+        self.n_tables = n_tables
+        self.n_bits = projection.shape[1] // n_tables
+        self.metadata = metadata or {}
+        self.resume_ids = [str(resume_id) for resume_id in resume_ids]
+        self.rows = {resume_id: row for row, resume_id in enumerate(self.resume_ids)}
+        self._lock = threading.Lock()
+        self._set_tables(indptr, indices, data, codes)
+
+    def _set_tables(self, indptr, indices, data, codes):
+        from scipy import sparse
+
+        matrix = sparse.csr_matrix((data, indices, indptr), shape=(len(indptr) - 1, self.projection.shape[0]))
+        # Per table: rows ordered by bucket code, so a bucket is one searchsorted range
+        order = np.argsort(codes, axis=0, kind='stable').T.astype(np.int32)
+        sorted_codes = np.take_along_axis(codes, order.T, axis=0).T.copy()
+        # Searches read this tuple once, so a concurrent compact() never mixes old and new tables
+        self._tables = (matrix, codes, order, sorted_codes, [], np.empty((0, self.n_tables), dtype=np.uint32))
+
+    @classmethod
+    def create(cls, dimension, n_tables=None, n_bits=None, seed=42, metadata=None):
+        """Empty index for vectors of the given dimension"""
+        n_tables = n_tables or SIMILARITY_TABLES
+        n_bits = n_bits or SIMILARITY_BITS
+        if not 1 <= n_bits <= 32:
+            raise ValueError("n_bits must be between 1 and 32")
+        rng = np.random.default_rng(seed)
+        projection = rng.choice(np.array([-1, 1], dtype=np.int8), size=(dimension, n_tables * n_bits))
+        return cls(projection, n_tables, np.zeros(1, dtype=np.int64), np.empty(0, dtype=np.int32),
+                   np.empty(0, dtype=np.float32), np.empty((0, n_tables), dtype=np.uint32), [], metadata)
+
+    def __len__(self):
+        return len(self.resume_ids)
+
+    @property
+    def max_probes(self):
+        """Every one- and two-bit neighbour of a bucket"""
+        return self.n_bits * (self.n_bits + 1) // 2
+
+    def _hash(self, projected):
+        """Bucket code per table for rows of projections (n, n_tables * n_bits)"""
+        bits = (projected > 0).reshape(len(projected), self.n_tables, self.n_bits)
+        return (bits.astype(np.uint32) << np.arange(self.n_bits, dtype=np.uint32)).sum(axis=2, dtype=np.uint32)
+
+    def _project(self, indices, weights):
+        return weights @ self.projection[indices].astype(np.float64)
+
+    def add(self, resume_id, indices, weights):
+        """Insert one resume vector; it is searchable immediately and merged into the tables on compact()"""
+        indices = np.asarray(indices, dtype=np.int32)
+        weights = np.asarray(weights, dtype=np.float32)
+        codes = self._hash(self._project(indices, weights)[None, :])
+        self._append([resume_id], [(indices, weights)], codes)
+
+    def add_matrix(self, resume_ids, matrix):
+        """Bulk-insert the rows of a CSR matrix of l2-normalized vectors"""
+        for start in range(0, matrix.shape[0], BUILD_CHUNK_SIZE):
+            chunk = matrix[start:start + BUILD_CHUNK_SIZE]
+            codes = self._hash(np.asarray(chunk @ self.projection.astype(np.float32)))
+            vectors = [(chunk.indices[chunk.indptr[row]:chunk.indptr[row + 1]].astype(np.int32),
+                        chunk.data[chunk.indptr[row]:chunk.indptr[row + 1]].astype(np.float32))
+                       for row in range(chunk.shape[0])]
+            self._append(resume_ids[start:start + BUILD_CHUNK_SIZE], vectors, codes)
+
+    def _append(self, resume_ids, vectors, codes):
+        resume_ids = [str(resume_id) for resume_id in resume_ids]
+        with self._lock:
+            duplicates = [resume_id for resume_id in resume_ids if resume_id in self.rows]
+            if duplicates or len(set(resume_ids)) < len(resume_ids):
+                raise ValueError(f"Resume '{(duplicates or resume_ids)[0]}' is already indexed")
+            for resume_id in resume_ids:
+                self.rows[resume_id] = len(self.resume_ids)
+                self.resume_ids.append(resume_id)
+            matrix, stored_codes, order, sorted_codes, pending, pending_codes = self._tables
+            self._tables = (matrix, stored_codes, order, sorted_codes, pending + vectors,
+                            np.vstack([pending_codes, codes]))
+
+    @property
+    def pending(self):
+        return len(self._tables[4])
+
+    def compact(self):
+        """Merge pending inserts into the sorted tables"""
+        with self._lock:
+            matrix, codes, _, _, pending, pending_codes = self._tables
+            if not pending:
+                return
+            indptr = np.concatenate([matrix.indptr.astype(np.int64),
+                                     matrix.nnz + np.cumsum([len(indices) for indices, _ in pending])])
+            indices = np.concatenate([matrix.indices] + [indices for indices, _ in pending]).astype(np.int32)
+            data = np.concatenate([matrix.data] + [weights for _, weights in pending]).astype(np.float32)
+            self._set_tables(indptr, indices, data, np.vstack([codes, pending_codes]))
+
+    def vector(self, resume_id):
+        """Stored (indices, weights) of an indexed resume"""
+        with self._lock:
+            row = self.rows[str(resume_id)]
+            matrix, _, _, _, pending, _ = self._tables
+        if row >= matrix.shape[0]:
+            return pending[row - matrix.shape[0]]
+        start, end = matrix.indptr[row], matrix.indptr[row + 1]
+        return matrix.indices[start:end], matrix.data[start:end]
+
+    def _probe_masks(self, margins, probes):
+        """XOR masks of the `probes` likeliest neighbouring buckets per table (query-directed multi-probe)"""
+        # A bit close to its hyperplane is the likeliest to differ for a near neighbour; one- and two-bit
+        # flips are ranked by the summed margins of the bits they flip
+        single = np.arange(self.n_bits)
+        first, second = np.triu_indices(self.n_bits, k=1)
+        flips = np.concatenate([np.uint32(1) << single.astype(np.uint32),
+                                (np.uint32(1) << first.astype(np.uint32)) | (np.uint32(1) << second.astype(np.uint32))])
+        scores = np.concatenate([margins, margins[:, first] + margins[:, second]], axis=1)
+        best = np.argsort(scores, axis=1, kind='stable')[:, :probes]
+        return flips[best]
+
+    def _candidates(self, tables, projected, probes):
+        """Rows sharing a probed bucket with the query in any table"""
+        matrix, _, order, sorted_codes, _, pending_codes = tables
+        codes = self._hash(projected[None, :])[0]
+        masks = self._probe_masks(np.abs(projected).reshape(self.n_tables, self.n_bits), probes)
+        probe_codes = np.concatenate([codes[:, None], codes[:, None] ^ masks], axis=1)
+
+        rows = []
+        for table in range(self.n_tables):
+            starts = np.searchsorted(sorted_codes[table], probe_codes[table], side='left')
+            ends = np.searchsorted(sorted_codes[table], probe_codes[table], side='right')
+            rows.extend(order[table][start:end] for start, end in zip(starts, ends) if end > start)
+            if len(pending_codes):
+                matches = np.flatnonzero(np.isin(pending_codes[:, table], probe_codes[table]))
+                rows.append((matrix.shape[0] + matches).astype(np.int32))
+        return np.unique(np.concatenate(rows)) if rows else np.empty(0, dtype=np.int32)
+
+    def _similarities(self, tables, rows, indices, weights):
+        """Exact cosine similarity of the query to the given rows (sorted)"""
+        matrix, _, _, _, pending, _ = tables
+        query = np.zeros(self.projection.shape[0])
+        query[indices] = weights
+        stored = rows[rows < matrix.shape[0]]
+        scores = np.empty(len(rows))
+        scores[:len(stored)] = matrix[stored] @ query
+        for position, row in enumerate(rows[len(stored):], len(stored)):
+            row_indices, row_weights = pending[row - matrix.shape[0]]
+            scores[position] = np.dot(query[row_indices], row_weights)
+        return scores
+
+    def search(self, indices, weights, top_k=10, probes=None, exclude=None, exact=None):
+        """Top_k (resume id, cosine) pairs plus counters; exact=None scans everything below SIMILARITY_EXACT_BELOW resumes"""
+        probes = SIMILARITY_PROBES if probes is None else probes
+        indices = np.asarray(indices, dtype=np.intp)
+        weights = np.asarray(weights, dtype=np.float64)
+        tables = self._tables
+        indexed = tables[0].shape[0] + len(tables[4])
+        exact = indexed < SIMILARITY_EXACT_BELOW if exact is None else exact
+        stats = {'exact': exact, 'probes': 0 if exact else min(max(probes, 0), self.max_probes),
+                 'candidates': 0, 'indexed': indexed}
+        if len(indices) == 0 or indexed == 0:
+            return [], stats
+
+        if exact:
+            rows = np.arange(indexed)
+        else:
+            rows = self._candidates(tables, self._project(indices, weights), stats['probes'])
+        if exclude is not None and self.rows.get(str(exclude), indexed) < indexed:
+            rows = rows[rows != self.rows[str(exclude)]]
+        stats['candidates'] = len(rows)
+        scores = self._similarities(tables, rows, indices, weights)
+        order = np.lexsort((rows, -scores))[:top_k]
+        return [(self.resume_ids[rows[i]], float(scores[i])) for i in order], stats
+
+    def save(self, path=None):
+        """Merge pending inserts and write the index as a memory-mappable artifact"""
+        self.compact()
+        with self._lock:
+            matrix, codes = self._tables[:2]
+            arrays = {
+                'projection': self.projection,
+                'indptr': matrix.indptr.astype(np.int64),
+                'indices': matrix.indices.astype(np.int32),
+                'data': matrix.data.astype(np.float32),
+                'codes': codes,
+                'resume_ids': np.array(self.resume_ids[:matrix.shape[0]], dtype=str)
+            }
+            metadata = dict(self.metadata, n_tables=self.n_tables, n_bits=self.n_bits, resumes=matrix.shape[0])
+        return save_artifact(path or DEFAULT_INDEX_PATH, SIMILARITY_INDEX_KIND, arrays, metadata)
+
+    @classmethod
+    def load(cls, path=None, mmap=True):
+        arrays, manifest = load_artifact(path or DEFAULT_INDEX_PATH, SIMILARITY_INDEX_KIND, mmap=mmap)
+        metadata = manifest['metadata']
+        return cls(arrays['projection'], metadata['n_tables'], arrays['indptr'], arrays['indices'], arrays['data'],
+                   arrays['codes'], arrays['resume_ids'].tolist(), metadata)
+
+
+def build_index(model, resume_ids, resume_texts, n_tables=None, n_bits=None):
+    """Index resumes with the TF-IDF vectors of a trained SmartHireModel"""
+    from scipy import sparse
+
+    indptr, indices, data = [0], [], []
+    for text in resume_texts:
+        row_indices, row_weights = model.resume_vector(text)
+        indices.append(row_indices)
+        data.append(row_weights)
+        indptr.append(indptr[-1] + len(row_indices))
+    matrix = sparse.csr_matrix((np.concatenate(data).astype(np.float32), np.concatenate(indices).astype(np.int32),
+                                np.array(indptr)), shape=(len(indptr) - 1, model.feature_dimension()))
+
+    index = SimilarityIndex.create(model.feature_dimension(), n_tables, n_bits,
+                                   metadata={'model_version': model.model_version})
+    index.add_matrix(list(resume_ids), matrix)
+    index.compact()
+    return index
+
+
+def evaluate(index, queries, top_k=10, probes_values=(0, 1, 2, 4, 8, 16)):
+    """Recall@k against the exact scan and mean latency for each probes setting, plus exact scan stats"""
+    exact, nearest, kth = {}, [], []
+    started = time.perf_counter()
+    for resume_id in queries:
+        hits, _ = index.search(*index.vector(resume_id), top_k, exclude=resume_id, exact=True)
+        exact[resume_id] = {hit for hit, _ in hits}
+        if hits:
+            nearest.append(hits[0][1])
+            kth.append(hits[-1][1])
+    exact_stats = {
+        'ms': round(1000 * (time.perf_counter() - started) / len(queries), 2),
+        'nearest_cosine': round(float(np.median(nearest)), 4) if nearest else None,
+        'kth_cosine': round(float(np.median(kth)), 4) if kth else None
+    }
+
+    report = []
+    for probes in probes_values:
+        recall, candidates = [], []
+        started = time.perf_counter()
+        for resume_id in queries:
+            hits, stats = index.search(*index.vector(resume_id), top_k, probes, exclude=resume_id, exact=False)
+            recall.append(len(exact[resume_id] & {hit for hit, _ in hits}) / max(1, len(exact[resume_id])))
+            candidates.append(stats['candidates'])
+        report.append({
+            'probes': probes,
+            'recall': round(float(np.mean(recall)), 4),
+            'candidates': int(np.mean(candidates)),
+            'ms': round(1000 * (time.perf_counter() - started) / len(queries), 2)
+        })
+    return report, exact_stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the similar-resume index from the resume corpus")
+    parser.add_argument('--output', default=DEFAULT_INDEX_PATH, help="Index artifact directory")
+    parser.add_argument('--tables', type=int, default=SIMILARITY_TABLES)
+    parser.add_argument('--bits', type=int, default=SIMILARITY_BITS)
+    parser.add_argument('--evaluate', type=int, default=0, metavar='N',
+                        help="Report recall@10 and latency per probes setting over N sample resumes")
+    args = parser.parse_args()
+
+    from model import SmartHireModel
+
+    model = SmartHireModel()
+    if model.load_artifact()['status'] != 'success':
+        print("❌ No trained model artifact; train the model first")
+        sys.exit(1)
+    df = model.data_loader.load_dataset()
+
+    started = time.perf_counter()
+    index = build_index(model, df.index, df['resume_text'], args.tables, args.bits)
+    manifest = index.save(args.output)
+    print(f"✅ Indexed {len(index)} resumes ({args.tables} tables x {args.bits} bits) in "
+          f"{time.perf_counter() - started:.1f}s: {args.output} ({manifest['content_hash'][:12]})")
+
+    if args.evaluate:
+        rng = np.random.default_rng(0)
+        queries = rng.choice(index.resume_ids, size=min(args.evaluate, len(index)), replace=False).tolist()
+        report, exact_stats = evaluate(index, queries)
+        print(f"\n📐 Median neighbour cosine: nearest {exact_stats['nearest_cosine']}, "
+              f"10th {exact_stats['kth_cosine']} (LSH pays off from ~0.8)")
+        print(f"\n{'probes':>6} {'recall@10':>10} {'candidates':>11} {'ms':>8}   (exact scan: {exact_stats['ms']} ms)")
+        for row in report:
+            print(f"{row['probes']:>6} {row['recall']:>10.4f} {row['candidates']:>11} {row['ms']:>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,14 +1,17 @@
 
 import pandas as pd
 import numpy as np
-import pickle
 import os
-import re
 from sklearn.feature_extraction.text import TfidfVectorizer
 from collections import defaultdict
 import nltk
 import warnings
 import json
+from role_scorer import RoleScorer
+from phrase_matcher import PhraseMatcher
+from job_catalog import save_job_catalog
+from corpus_cache import DEFAULT_CACHE_PATH, USE_CORPUS_CACHE, load_corpus_cache
+from evaluation import clean_resume_text, evaluate_predictions, score_resumes
 warnings.filterwarnings('ignore')
 
 class CompleteJobRoleSystem:
@@ -19,7 +22,12 @@ class CompleteJobRoleSystem:
         self.vectorizer = TfidfVectorizer(max_features=5000, stop_words='english', ngram_range=(1, 2))
         self.job_role_texts = []
         self.job_role_names = []
+        self.role_domains = []
+        self.role_scorer = None
+        self.keyword_matcher = None
         self.results = []
+        self.confusion_labels = []
+        self.confusion_matrix = None
         
     def ensure_nltk_data(self):
         """Ensure NLTK data is available"""
@@ -336,13 +344,7 @@ class CompleteJobRoleSystem:
             if pd.isna(text) or text is None:
                 return ""
             
-            text = str(text).lower()
-            text = re.sub(r'<.*?>', '', text)
-            text = re.sub(r'http\S+', '', text)
-            text = re.sub(r'[^a-zA-Z\s]', ' ', text)
-            text = re.sub(r'\s+', ' ', text).strip()
-            
-            return text
+            return clean_resume_text(text)
         except Exception as e:
             print(f"⚠️  Text cleaning error: {e}")
             return ""
@@ -383,6 +385,14 @@ class CompleteJobRoleSystem:
             # Try different encodings
             encodings = ['utf-8', 'latin-1', 'iso-8859-1', 'cp1252', 'windows-1252']
             df = None
+            required_columns = ['ID', 'Resume_str', 'Resume_html', 'Category']
+            
+            if csv_path.endswith('.parquet'):
+                # PDF corpus extracted by corpus_cache.py; it has no HTML column
+                df = load_corpus_cache(csv_path)
+                encodings = []
+                required_columns = ['ID', 'Resume_str', 'Category']
+                print("✅ Successfully loaded corpus cache")
             
             for encoding in encodings:
                 try:
@@ -403,7 +413,6 @@ class CompleteJobRoleSystem:
             print(f"📋 Columns: {df.columns.tolist()}")
             
             # Validate required columns - check for case sensitivity and variations
-            required_columns = ['ID', 'Resume_str', 'Resume_html', 'Category']
             available_columns = df.columns.tolist()
             
             # Check for case-insensitive matches
@@ -462,6 +471,7 @@ class CompleteJobRoleSystem:
         print("🔄 Preparing job role corpus...")
         
         try:
+            self.job_roles_data = job_structure
             self.job_role_texts = []
             self.job_role_names = []
             self.role_keywords = {}
@@ -482,6 +492,17 @@ class CompleteJobRoleSystem:
                     self.domain_to_roles[domain].append(role_name)
                     role_count += 1
             
+            # A role name listed under several domains resolves to the first one
+            first_domain = {}
+            for domain, roles in self.domain_to_roles.items():
+                for role_name in roles:
+                    first_domain.setdefault(role_name, domain)
+            self.role_domains = [first_domain.get(name) for name in self.job_role_names]
+            self.role_scorer = RoleScorer(self.job_role_names, self.role_keywords, self.role_domains)
+            self.keyword_matcher = PhraseMatcher(
+                keyword for keywords in self.role_keywords.values() for keyword in keywords
+            )
+            
             print(f"✅ Prepared {role_count} job roles across {len(self.domain_to_roles)} domains")
             
             # Show sample of roles
@@ -507,13 +528,20 @@ class CompleteJobRoleSystem:
             print(f"❌ Error training TF-IDF model: {e}")
             raise
     
-    def calculate_keyword_match_score(self, resume_text, job_keywords):
+    def extract_resume_terms(self, resume_text):
+        """Resume words plus every catalog keyword phrase found in the text"""
+        resume_terms = set(resume_text.lower().split())
+        if self.keyword_matcher is not None:
+            resume_terms.update(self.keyword_matcher.find(resume_text))
+        return resume_terms
+    
+    def calculate_keyword_match_score(self, resume_text, job_keywords, resume_terms=None):
         """Calculate match score based on keyword overlap safely"""
         try:
             if not resume_text or not job_keywords:
                 return 0.0
             
-            resume_words = set(resume_text.lower().split())
+            resume_words = resume_terms if resume_terms is not None else self.extract_resume_terms(resume_text)
             job_words = set(job_keywords)  # job_keywords is now a list
             
             if not job_words:
@@ -550,10 +578,11 @@ class CompleteJobRoleSystem:
             
             # Calculate match scores for all job roles
             match_scores = []
+            resume_terms = self.extract_resume_terms(cleaned_resume)
             
             for role_name in self.job_role_names:
                 job_keywords = self.role_keywords.get(role_name, [])
-                match_score = self.calculate_keyword_match_score(cleaned_resume, job_keywords)
+                match_score = self.calculate_keyword_match_score(cleaned_resume, job_keywords, resume_terms)
                 
                 # Find domain for this role
                 domain = None
@@ -566,7 +595,7 @@ class CompleteJobRoleSystem:
                     'job_role': role_name,
                     'domain': domain,
                     'match_score': round(match_score * 100, 2),
-                    'matching_keywords': list(set(cleaned_resume.split()) & set(job_keywords))[:5]  # Limit to 5 keywords
+                    'matching_keywords': list(resume_terms & set(job_keywords))[:5]  # Limit to 5 keywords
                 })
             
             # Sort by match score and get top K
@@ -582,6 +611,35 @@ class CompleteJobRoleSystem:
             print(f"⚠️  Prediction error: {e}")
             return [], "Unknown"
     
+    def predict_top_roles_batch(self, texts, top_k=3):
+        """Predict top job roles for many resumes with one vectorized scoring pass"""
+        cleaned_texts = [self.clean_text(text) for text in texts]
+        token_lists = [cleaned.split() for cleaned in cleaned_texts]
+        token_sets = [set(tokens) | self.keyword_matcher.find_tokens(tokens) for tokens in token_lists]
+        
+        scores = self.role_scorer.score(token_sets)
+        top_indices = self.role_scorer.top_k(scores, top_k)
+        
+        predictions = []
+        for row, cleaned_resume in enumerate(cleaned_texts):
+            if not cleaned_resume or len(token_lists[row]) < 5:
+                predictions.append(([], "Unknown"))
+                continue
+            
+            top_roles = []
+            for role_idx in top_indices[row].tolist():
+                role_name = self.job_role_names[role_idx]
+                top_roles.append({
+                    'job_role': role_name,
+                    'domain': self.role_domains[role_idx],
+                    'match_score': round(float(scores[row, role_idx]) * 100, 2),
+                    'matching_keywords': [kw for kw in self.role_keywords.get(role_name, []) if kw in token_sets[row]][:5]
+                })
+            
+            predictions.append((top_roles, self.predict_domain_from_roles(top_roles)))
+        
+        return predictions
+    
     def predict_domain_from_roles(self, top_roles):
         """Predict domain based on top job roles safely"""
         try:
@@ -630,82 +688,14 @@ class CompleteJobRoleSystem:
             
             # Step 6: Evaluate on all resumes
             print(f"\n🔍 Evaluating model on {len(df)} resumes...")
-            self.results = []
-            correct_predictions = 0
-            domain_accuracy = defaultdict(lambda: {'correct': 0, 'total': 0})
-            top_k_accuracy = {1: 0, 2: 0, 3: 0}
+            evaluation = self.evaluate_resumes(df)
             
-            for idx, row in df.iterrows():
-                try:
-                    resume_id = row['ID'] if 'ID' in row else idx
-                    resume_text = row['Resume_str']  # Using Resume_str column
-                    true_domain = row['Category']
-                    
-                    # Predict top job roles
-                    top_roles, predicted_domain = self.predict_top_roles_for_resume(resume_text, top_k=3)
-                    
-                    # Check accuracy
-                    is_correct = (predicted_domain == true_domain)
-                    if is_correct:
-                        correct_predictions += 1
-                    
-                    # Update Top-K accuracy
-                    predicted_domains = [role['domain'] for role in top_roles if role['domain']]
-                    for k in [1, 2, 3]:
-                        if true_domain in predicted_domains[:k]:
-                            top_k_accuracy[k] += 1
-                    
-                    # Store results
-                    result = {
-                        'resume_id': resume_id,
-                        'true_domain': true_domain,
-                        'predicted_domain': predicted_domain,
-                        'is_correct': is_correct,
-                        'top_roles': top_roles,
-                        'top_role_names': [role['job_role'] for role in top_roles],
-                        'top_role_scores': [role['match_score'] for role in top_roles]
-                    }
-                    self.results.append(result)
-                    
-                    # Update domain accuracy
-                    domain_accuracy[true_domain]['total'] += 1
-                    if is_correct:
-                        domain_accuracy[true_domain]['correct'] += 1
-                    
-                    # Progress update
-                    if (idx + 1) % 100 == 0:
-                        current_accuracy = correct_predictions / (idx + 1)
-                        print(f"   Processed {idx + 1}/{len(df)} resumes | Current Accuracy: {current_accuracy:.4f}")
-                        
-                except Exception as e:
-                    print(f"⚠️  Error processing resume {idx}: {e}")
-                    continue
-            
-            # Calculate final metrics
-            total_resumes = len(self.results)
-            if total_resumes == 0:
+            if len(self.results) == 0:
                 raise ValueError("No results generated from evaluation")
             
-            overall_accuracy = correct_predictions / total_resumes
-            
-            # Calculate domain-wise accuracy
-            domain_wise_accuracy = {}
-            for domain, stats in domain_accuracy.items():
-                if stats['total'] > 0:
-                    domain_wise_accuracy[domain] = {
-                        'accuracy': stats['correct'] / stats['total'],
-                        'correct': stats['correct'],
-                        'total': stats['total']
-                    }
-            
-            # Calculate Top-K accuracy percentages
-            top_k_results = {}
-            for k, count in top_k_accuracy.items():
-                top_k_results[f'top_{k}'] = {
-                    'accuracy': count / total_resumes,
-                    'correct': count,
-                    'total': total_resumes
-                }
+            overall_accuracy = evaluation['overall_accuracy']
+            domain_wise_accuracy = evaluation['domain_accuracy']
+            top_k_results = evaluation['top_k_results']
             
             return overall_accuracy, domain_wise_accuracy, top_k_results, df
             
@@ -715,6 +705,54 @@ class CompleteJobRoleSystem:
             traceback.print_exc()
             raise
     
+    def evaluate_resumes(self, df, top_k=3, workers=None):
+        """Score every resume in chunks across worker processes and tally accuracy with array operations"""
+        texts = df['Resume_str'].tolist()
+        true_domains = df['Category'].tolist()
+        resume_ids = df['ID'].tolist() if 'ID' in df.columns else df.index.tolist()
+        
+        domains = list(self.domain_to_roles)
+        domain_ids = {domain: idx for idx, domain in enumerate(domains)}
+        role_domain_ids = np.array([domain_ids[domain] for domain in self.role_domains], dtype=np.int64)
+        
+        evaluated_correct = 0
+        
+        def report_progress(start, chunk_ids):
+            nonlocal evaluated_correct
+            evaluated_correct += int(evaluate_predictions(
+                chunk_ids, role_domain_ids, domains, true_domains[start:start + len(chunk_ids)])['correct'].sum())
+            processed = start + len(chunk_ids)
+            print(f"   Processed {processed}/{len(df)} resumes | Current Accuracy: {evaluated_correct / processed:.4f}")
+        
+        top_role_ids, top_scores, matching_keywords = score_resumes(
+            texts, self.job_role_names, self.role_keywords, self.role_domains,
+            top_k=top_k, workers=workers, progress=report_progress
+        )
+        evaluation = evaluate_predictions(top_role_ids, role_domain_ids, domains, true_domains)
+        self.confusion_labels = evaluation['labels']
+        self.confusion_matrix = evaluation['confusion_matrix']
+        
+        self.results = []
+        for row, resume_id in enumerate(resume_ids):
+            top_roles = [{
+                'job_role': self.job_role_names[role_idx],
+                'domain': self.role_domains[role_idx],
+                'match_score': round(float(score) * 100, 2),
+                'matching_keywords': keywords
+            } for role_idx, score, keywords in zip(top_role_ids[row].tolist(), top_scores[row].tolist(),
+                                                   matching_keywords[row])]
+            self.results.append({
+                'resume_id': resume_id,
+                'true_domain': true_domains[row],
+                'predicted_domain': evaluation['predicted_domains'][row],
+                'is_correct': bool(evaluation['correct'][row]),
+                'top_roles': top_roles,
+                'top_role_names': [role['job_role'] for role in top_roles],
+                'top_role_scores': [role['match_score'] for role in top_roles]
+            })
+        
+        return evaluation
+    
     def generate_comprehensive_report(self, overall_accuracy, domain_accuracy, top_k_results, df):
         """Generate comprehensive evaluation report"""
         print("\n" + "="*80)
@@ -754,23 +792,14 @@ class CompleteJobRoleSystem:
         print(f"   Medium Accuracy (60-80%): {medium_acc} domains")
         print(f"   Low Accuracy (<60%): {low_acc} domains")
     
-    def save_complete_model(self, filepath='complete_job_matching_system.pkl'):
-        """Save the complete trained system"""
+    def save_complete_model(self, filepath='models/job_catalog'):
+        """Save the complete trained system as a compiled job catalog artifact"""
         try:
-            model_data = {
-                'job_role_names': self.job_role_names,
-                'job_role_texts': self.job_role_texts,
-                'role_keywords': self.role_keywords,
-                'domain_to_roles': self.domain_to_roles,
-                'vectorizer': self.vectorizer
-            }
-            
             # Ensure directory exists
             os.makedirs(os.path.dirname(filepath) if os.path.dirname(filepath) else '.', exist_ok=True)
             
-            with open(filepath, 'wb') as f:
-                pickle.dump(model_data, f)
-            print(f"💾 Model saved to {filepath}")
+            manifest = save_job_catalog(filepath, self.job_roles_data, self.vectorizer)
+            print(f"💾 Model artifact {manifest['content_hash'][:12]} saved to {filepath}")
             
         except Exception as e:
             print(f"❌ Error saving model: {e}")
@@ -789,7 +818,11 @@ class CompleteJobRoleSystem:
                 },
                 'performance_metrics': {
                     'top_k_accuracy': top_k_results,
-                    'domain_accuracy': {k: v for k, v in domain_accuracy.items()}
+                    'domain_accuracy': {k: v for k, v in domain_accuracy.items()},
+                    'confusion_matrix': {
+                        'labels': self.confusion_labels,
+                        'matrix': self.confusion_matrix.tolist() if self.confusion_matrix is not None else []
+                    }
                 }
             }
             
@@ -815,6 +848,12 @@ def main():
     
     # CSV path - FIXED PATH HANDLING
     csv_path = r"dataset\Resume\Resume.csv"  # Using raw string for Windows paths
+    if USE_CORPUS_CACHE:
+        # Opt-in: train on the PDF corpus extracted by corpus_cache.py instead
+        if os.path.exists(DEFAULT_CACHE_PATH):
+            csv_path = DEFAULT_CACHE_PATH
+        else:
+            print(f"⚠️ RESUME_USE_CORPUS_CACHE is set but {DEFAULT_CACHE_PATH} does not exist")
     
     try:
         # Train and evaluate complete system
@@ -824,7 +863,7 @@ def main():
         system.generate_comprehensive_report(overall_accuracy, domain_accuracy, top_k_results, df)
         
         # Save complete model
-        system.save_complete_model('backend/complete_job_matching_system.pkl')
+        system.save_complete_model('backend/models/job_catalog')
         
         # Save evaluation results
         system.save_evaluation_results(overall_accuracy, domain_accuracy, top_k_results,
@@ -833,7 +872,7 @@ def main():
         # Final success message
         print(f"\n🎉 TRAINING COMPLETED SUCCESSFULLY!")
         print(f"📈 Final Accuracy: {overall_accuracy:.4f} ({overall_accuracy*100:.2f}%)")
-        print(f"📁 Model saved: complete_job_matching_system.pkl")
+        print(f"📁 Model saved: backend/models/job_catalog")
         print(f"📋 Report saved: training_evaluation_report.json")
         
         # Test prediction